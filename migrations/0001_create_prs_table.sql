@@ -46,5 +46,7 @@ CREATE TABLE IF NOT EXISTS prs (
     readiness_computed_at TEXT,
     is_draft INTEGER DEFAULT 0,
     open_conversations_count INTEGER DEFAULT 0,
-    reviewers_json TEXT
+    reviewers_json TEXT,
+    -- GitHub ETag of the PR, sent as If-None-Match on refresh
+    etag TEXT
 );
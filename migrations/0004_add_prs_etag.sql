@@ -0,0 +1,8 @@
+-- Migration: Add etag column to prs
+-- Created: 2026-10-15
+-- Description: Intentionally a no-op. prs.etag has been read and written by the worker
+-- since before this migration existed, so deployed databases already have the column
+-- and an ALTER TABLE ... ADD COLUMN would fail with "duplicate column name" (SQLite has
+-- no ADD COLUMN IF NOT EXISTS). Fresh databases get the column from 0001_create_prs_table.sql.
+
+SELECT 1;
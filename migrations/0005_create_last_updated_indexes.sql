@@ -0,0 +1,9 @@
+-- Migration: Create indexes for the default PR list ordering
+-- Created: 2026-10-15
+-- Description: Let the default list query read rows in index order instead of sorting them.
+-- The keys mirror the default ORDER BY in handle_list_prs exactly
+-- (last_updated_at IS NOT NULL, last_updated_at DESC); a plain last_updated_at
+-- index would not match the leading expression and SQLite would still sort.
+
+CREATE INDEX IF NOT EXISTS idx_last_updated ON prs(last_updated_at IS NOT NULL, last_updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_repo_last_updated ON prs(repo_owner, repo_name, last_updated_at IS NOT NULL, last_updated_at DESC);
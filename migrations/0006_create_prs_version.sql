@@ -0,0 +1,28 @@
+-- Migration: Create a change counter for the prs table
+-- Created: 2026-10-15
+-- Description: Give the PR list ETag a strictly monotonic validator.
+-- updated_at comes from CURRENT_TIMESTAMP (one-second resolution), so a write in
+-- the same second as a listing left COUNT(*) + MAX(updated_at) unchanged. These
+-- triggers bump prs_version.version on every insert, update and delete instead.
+
+CREATE TABLE IF NOT EXISTS prs_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO prs_version (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS prs_version_after_insert AFTER INSERT ON prs
+BEGIN
+    UPDATE prs_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS prs_version_after_update AFTER UPDATE ON prs
+BEGIN
+    UPDATE prs_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS prs_version_after_delete AFTER DELETE ON prs
+BEGIN
+    UPDATE prs_version SET version = version + 1 WHERE id = 1;
+END;
@@ -5,6 +5,7 @@ import hmac
 import json
 import os
 import secrets
+import time
 from typing import Dict, Optional, Tuple
 from urllib.parse import unquote
 
@@ -19,6 +20,16 @@ STATE_MAX_AGE = 60 * 10  # 10 minutes
 _cached_key_bytes = None
 _cached_crypto_key = None
 
+# Decrypted session plaintext keyed by the raw cookie value, so repeat requests
+# from the same session skip the AES-GCM decrypt. Tied to the crypto key that
+# produced it and dropped when ENCRYPTION_KEY changes. The plaintext holds the
+# user's access token, so entries expire after _SESSION_CACHE_TTL seconds and
+# the least recently used entry is evicted once the cache is full.
+_session_plaintext_cache: Dict[str, Tuple[float, str]] = {}
+_session_cache_crypto_key = None
+_SESSION_CACHE_MAX_ENTRIES = 256
+_SESSION_CACHE_TTL = 300
+
 
 def _bytes_to_uint8array(data: bytes):
     arr = Uint8Array.new(len(data))
@@ -206,6 +217,8 @@ async def encrypt_session(payload: dict, env) -> str:
 
 
 async def decrypt_session(encoded_payload: str, env) -> dict:
+    global _session_cache_crypto_key
+
     if not encoded_payload:
         raise ValueError('Missing encrypted payload')
 
@@ -213,10 +226,22 @@ async def decrypt_session(encoded_payload: str, env) -> dict:
     if len(parts) != 3 or parts[0] != 'v1':
         raise ValueError('Unsupported session payload format')
 
+    key = await _get_crypto_key(env)
+    if key is not _session_cache_crypto_key:
+        _session_plaintext_cache.clear()
+        _session_cache_crypto_key = key
+
+    # Parsed fresh on every hit so callers never share a payload dict
+    now = time.monotonic()
+    entry = _session_plaintext_cache.pop(encoded_payload, None)
+    if entry is not None and entry[0] > now:
+        # Re-insert so the entry moves to the most recently used end
+        _session_plaintext_cache[encoded_payload] = entry
+        return json.loads(entry[1])
+
     iv = _b64url_decode(parts[1])
     ciphertext = _b64url_decode(parts[2])
 
-    key = await _get_crypto_key(env)
     params = to_js(
         {'name': 'AES-GCM', 'iv': _bytes_to_uint8array(iv)},
         dict_converter=Object.fromEntries
@@ -229,7 +254,13 @@ async def decrypt_session(encoded_payload: str, env) -> dict:
     )
 
     decrypted_bytes = _uint8array_to_bytes(Uint8Array.new(decrypted_buffer))
-    return json.loads(decrypted_bytes.decode('utf-8'))
+    plaintext = decrypted_bytes.decode('utf-8')
+    payload = json.loads(plaintext)
+
+    if len(_session_plaintext_cache) >= _SESSION_CACHE_MAX_ENTRIES:
+        del _session_plaintext_cache[next(iter(_session_plaintext_cache))]
+    _session_plaintext_cache[encoded_payload] = (now + _SESSION_CACHE_TTL, plaintext)
+    return payload
 
 
 async def get_oauth_session(request, env) -> Tuple[Optional[dict], bool]:
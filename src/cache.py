@@ -1,5 +1,7 @@
 """Caching and rate limiting functionality"""
 
+import json
+import random
 import time
 
 # In-memory cache for rate limit data (per worker isolate)
@@ -14,22 +16,34 @@ _rate_limit_cache = {
 _RATE_LIMIT_CACHE_TTL = 300
 
 # Application-level rate limiting for readiness endpoints
-# Tracks requests per IP address with sliding window
+# Token bucket per IP address: each IP may burst up to _READINESS_RATE_LIMIT
+# requests, refilled continuously at _READINESS_RATE_LIMIT per window
 _readiness_rate_limit = {
-    # Structure: {'ip_address': {'count': int, 'window_start': float}}
+    # Structure: {'ip_address': (tokens: float, last_refill: float)}
+    # Insertion order is least recently seen first
 }
 # Rate limit: 30 requests per minute per IP for readiness endpoints
 # This allows "Analyze All" to succeed for up to 30 PRs without hitting the limit.
 _READINESS_RATE_LIMIT = 30
 _READINESS_RATE_WINDOW = 60  # seconds
+_READINESS_REFILL_RATE = _READINESS_RATE_LIMIT / _READINESS_RATE_WINDOW  # tokens per second
+# Idle buckets are swept every _RATE_LIMIT_SWEEP_INTERVAL checks; the map is
+# capped at _RATE_LIMIT_MAX_IPS entries, dropping least recently seen IPs first
+_RATE_LIMIT_SWEEP_INTERVAL = 100
+_RATE_LIMIT_MAX_IPS = 10000
+_rate_limit_checks = 0
 
 # In-memory cache for readiness results
 # Invalidated when PR is manually refreshed
 _readiness_cache = {
-    # Structure: {pr_id: {'data': dict, 'timestamp': float}}
+    # Structure: {pr_id: {'data': dict, 'timestamp': float, 'ttl': float, 'body': str (optional)}}
+    # 'body' memoizes json.dumps(data) for cache-hit responses
 }
 # Cache TTL in seconds (10 minutes)
 _READINESS_CACHE_TTL = 600
+# Each entry's TTL is offset by up to this many seconds either way, so entries
+# written together (e.g. "Analyze All") don't all expire in the same second
+_READINESS_CACHE_JITTER = 60
 
 # In-memory cache for timeline data
 # Reduces redundant API calls across timeline/review-analysis/readiness endpoints
@@ -40,6 +54,19 @@ _timeline_cache = {
 # Cache TTL in seconds (30 minutes - timeline data changes less frequently)
 _TIMELINE_CACHE_TTL = 1800
 
+# In-memory cache of conditional-request validators for GitHub GET endpoints
+# A 304 Not Modified does not count against the primary rate limit, so we keep
+# the last body per URL and revalidate it with If-None-Match
+_etag_cache = {
+    # Structure: {(url, token): {'etag': str, 'data': parsed JSON, 'size': int}}
+    # 'size' counts the items held (a timeline page is up to 100 objects)
+}
+# Oldest entries are evicted first once either bound is exceeded; the item
+# bound keeps full timeline pages from dominating isolate memory
+_ETAG_CACHE_MAX_ENTRIES = 200
+_ETAG_CACHE_MAX_ITEMS = 2000
+_etag_cache_items = 0
+
 
 def check_rate_limit(ip_address):
     """Check if request from IP is within rate limit for readiness endpoints.
@@ -52,42 +79,54 @@ def check_rate_limit(ip_address):
         - allowed: True if request is allowed, False if rate limited
         - retry_after: Seconds to wait before retrying (0 if allowed)
     """
-    global _readiness_rate_limit
+    global _rate_limit_checks
     
     current_time = time.time()
     
-    if ip_address not in _readiness_rate_limit:
-        _readiness_rate_limit[ip_address] = {
-            'count': 1,
-            'window_start': current_time
-        }
-        print(f"Rate limit: New IP {ip_address} - count: 1")
-        return (True, 0)
+    _rate_limit_checks += 1
+    if _rate_limit_checks >= _RATE_LIMIT_SWEEP_INTERVAL:
+        _rate_limit_checks = 0
+        _sweep_rate_limit_buckets(current_time)
     
-    rate_data = _readiness_rate_limit[ip_address]
-    window_elapsed = current_time - rate_data['window_start']
-    
-    # Reset window if expired
-    if window_elapsed >= _READINESS_RATE_WINDOW:
-        _readiness_rate_limit[ip_address] = {
-            'count': 1,
-            'window_start': current_time
-        }
-        print(f"Rate limit: Window reset for {ip_address} - count: 1")
+    # Re-insert so the IP moves to the end of the eviction order
+    bucket = _readiness_rate_limit.pop(ip_address, None)
+    if bucket is None:
+        tokens = _READINESS_RATE_LIMIT
+        print(f"Rate limit: New IP {ip_address}")
+    else:
+        tokens, last_refill = bucket
+        tokens = min(_READINESS_RATE_LIMIT, tokens + (current_time - last_refill) * _READINESS_REFILL_RATE)
+    
+    if tokens >= 1:
+        _readiness_rate_limit[ip_address] = (tokens - 1, current_time)
+        while len(_readiness_rate_limit) > _RATE_LIMIT_MAX_IPS:
+            del _readiness_rate_limit[next(iter(_readiness_rate_limit))]
+        print(f"Rate limit: {ip_address} - {int(tokens - 1)}/{_READINESS_RATE_LIMIT} remaining")
         return (True, 0)
     
-    # Check if within limit
-    if rate_data['count'] < _READINESS_RATE_LIMIT:
-        rate_data['count'] += 1
-        print(f"Rate limit: {ip_address} - count: {rate_data['count']}/{_READINESS_RATE_LIMIT}")
-        return (True, 0)
+    _readiness_rate_limit[ip_address] = (tokens, current_time)
     
-    # Rate limited - calculate retry_after
-    retry_after = int(_READINESS_RATE_WINDOW - window_elapsed) + 1
+    # Rate limited - seconds until one token has refilled
+    retry_after = int((1 - tokens) / _READINESS_REFILL_RATE) + 1
     print(f"Rate limit: EXCEEDED for {ip_address} - retry after {retry_after}s")
     return (False, retry_after)
 
 
+def _sweep_rate_limit_buckets(current_time):
+    """Drop buckets idle long enough to have refilled completely.
+    
+    A missing entry is treated as a full bucket, so this never changes a decision.
+    """
+    idle_cutoff = current_time - _READINESS_RATE_WINDOW
+    for ip_address in [ip for ip, (_, last_refill) in _readiness_rate_limit.items() if last_refill <= idle_cutoff]:
+        del _readiness_rate_limit[ip_address]
+
+
+def _jittered_readiness_ttl():
+    """Readiness cache TTL with random jitter to spread out expirations"""
+    return _READINESS_CACHE_TTL + random.uniform(-_READINESS_CACHE_JITTER, _READINESS_CACHE_JITTER)
+
+
 async def get_readiness_cache(env, pr_id):
     """Get cached readiness result for a PR if still valid.
     
@@ -111,7 +150,7 @@ async def get_readiness_cache(env, pr_id):
         current_time = time.time()
         
         # Check if cache is still valid
-        if (current_time - cache_entry['timestamp']) < _READINESS_CACHE_TTL:
+        if (current_time - cache_entry['timestamp']) < cache_entry['ttl']:
             age = int(current_time - cache_entry['timestamp'])
             print(f"Cache: HIT (memory) for PR {pr_id} (age: {age}s)")
             return cache_entry['data']
@@ -129,7 +168,8 @@ async def get_readiness_cache(env, pr_id):
         current_time = time.time()
         _readiness_cache[pr_id] = {
             'data': db_data,
-            'timestamp': current_time
+            'timestamp': current_time,
+            'ttl': _jittered_readiness_ttl()
         }
         print(f"Cache: HIT (database) for PR {pr_id} - loaded into memory")
         return db_data
@@ -138,6 +178,28 @@ async def get_readiness_cache(env, pr_id):
     return None
 
 
+async def get_readiness_cache_body(env, pr_id):
+    """Get cached readiness result for a PR as a serialized JSON body.
+    
+    The body is serialized once per memory cache entry, so repeated hits for
+    the same PR skip json.dumps.
+    
+    Returns:
+        JSON string if valid, None if expired or not found
+    """
+    data = await get_readiness_cache(env, pr_id)
+    if data is None:
+        return None
+    
+    cache_entry = _readiness_cache.get(pr_id)
+    if cache_entry is None:
+        return json.dumps(data)
+    body = cache_entry.get('body')
+    if body is None:
+        body = cache_entry['body'] = json.dumps(data)
+    return body
+
+
 async def set_readiness_cache(env, pr_id, data):
     """Cache readiness result for a PR in both memory and database.
     
@@ -155,7 +217,8 @@ async def set_readiness_cache(env, pr_id, data):
     current_time = time.time()
     _readiness_cache[pr_id] = {
         'data': data,
-        'timestamp': current_time
+        'timestamp': current_time,
+        'ttl': _jittered_readiness_ttl()
     }
     print(f"Cache: Stored result (memory) for PR {pr_id}")
     
@@ -170,20 +233,24 @@ async def invalidate_readiness_cache(env, pr_id):
         env: Worker environment with database binding
         pr_id: PR ID
     """
-    global _readiness_cache
-    
     # Import here to avoid circular dependency
     from database import delete_readiness_from_db
     
-    # Remove from memory cache
-    if pr_id in _readiness_cache:
-        del _readiness_cache[pr_id]
-        print(f"Cache: Invalidated (memory) for PR {pr_id}")
+    evict_readiness_cache(pr_id)
     
     # Also remove from database
     await delete_readiness_from_db(env, pr_id)
 
 
+def evict_readiness_cache(pr_id):
+    """Drop a PR's readiness result from the memory cache only.
+    
+    For callers that clear the database copy themselves, e.g. as part of a D1 batch.
+    """
+    if _readiness_cache.pop(pr_id, None) is not None:
+        print(f"Cache: Invalidated (memory) for PR {pr_id}")
+
+
 def get_timeline_cache_key(owner, repo, pr_number):
     """Generate cache key for timeline data"""
     return f"{owner}/{repo}/{pr_number}"
@@ -289,21 +356,56 @@ async def invalidate_timeline_cache(env, owner, repo, pr_number):
         repo: Repository name
         pr_number: PR number
     """
-    global _timeline_cache
-    
     # Import here to avoid circular dependency
     from database import delete_timeline_from_db
     
-    cache_key = get_timeline_cache_key(owner, repo, pr_number)
-    
-    # Remove from memory cache
-    if cache_key in _timeline_cache:
-        del _timeline_cache[cache_key]
-        print(f"Timeline Cache: Invalidated (memory) for {cache_key}")
+    evict_timeline_cache(owner, repo, pr_number)
     
     # Also remove from database
     await delete_timeline_from_db(env, owner, repo, pr_number)
 
+
+def evict_timeline_cache(owner, repo, pr_number):
+    """Drop a PR's timeline from the memory cache only.
+    
+    For callers that delete the database copy themselves, e.g. as part of a D1 batch.
+    """
+    cache_key = get_timeline_cache_key(owner, repo, pr_number)
+    if _timeline_cache.pop(cache_key, None) is not None:
+        print(f"Timeline Cache: Invalidated (memory) for {cache_key}")
+
+
+def get_etag_cache(url, token=None):
+    """Get the cached ETag and body for a GitHub URL, or None if not cached.
+    
+    Entries are keyed by token as well as URL because GitHub varies
+    responses (and ETags) on the Authorization header.
+    """
+    return _etag_cache.get((url, token))
+
+
+def set_etag_cache(url, token, etag, data, size=1):
+    """Cache the ETag and parsed body returned for a GitHub URL
+    
+    size is the number of items in data, counted against _ETAG_CACHE_MAX_ITEMS.
+    Bodies larger than the whole bound are not cached.
+    """
+    global _etag_cache, _etag_cache_items
+    
+    key = (url, token)
+    # Re-insert so the entry moves to the end of the eviction order
+    previous = _etag_cache.pop(key, None)
+    if previous is not None:
+        _etag_cache_items -= previous['size']
+    if size > _ETAG_CACHE_MAX_ITEMS:
+        return
+    _etag_cache[key] = {'etag': etag, 'data': data, 'size': size}
+    _etag_cache_items += size
+    
+    while len(_etag_cache) > _ETAG_CACHE_MAX_ENTRIES or _etag_cache_items > _ETAG_CACHE_MAX_ITEMS:
+        _etag_cache_items -= _etag_cache.pop(next(iter(_etag_cache)))['size']
+
+
 def set_rate_limit_data(limit, remaining, reset):
     """
     Updates the global GitHub rate limit cache with data from API headers.
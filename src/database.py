@@ -2,7 +2,35 @@
 
 import json
 import time
-from datetime import datetime, timezone
+from pyodide.ffi import to_js
+from utils import utc_now_iso
+
+
+# Prepared statements keyed by SQL text, reused for as long as the D1 binding
+# is the same object. bind() returns a new statement, so sharing them is safe.
+_prepared_db = None
+_prepared_statements = {}
+
+
+def prepared(db, sql):
+    """Return db.prepare(sql), reusing an earlier statement for the same SQL and binding"""
+    global _prepared_db
+    
+    if db != _prepared_db:
+        _prepared_statements.clear()
+        _prepared_db = db
+    
+    stmt = _prepared_statements.get(sql)
+    if stmt is None:
+        stmt = db.prepare(sql)
+        _prepared_statements[sql] = stmt
+    return stmt
+
+
+# D1 binding resolved by get_db, remembered for as long as env is the same
+# object so repeat calls skip the hasattr/getattr probes across the JS boundary
+_db_env = None
+_db_binding = None
 
 
 def get_db(env):
@@ -10,6 +38,19 @@ def get_db(env):
     
     Raises an exception if database is not configured.
     """
+    global _db_env, _db_binding
+    
+    if _db_binding is not None and env == _db_env:
+        return _db_binding
+    
+    db = _lookup_db_binding(env)
+    _db_env = env
+    _db_binding = db
+    return db
+
+
+def _lookup_db_binding(env):
+    """Find the D1 binding on env, raising if database is not configured"""
     # Try common binding names
     for name in ['pr_tracker', 'DB']:
         # Try attribute access
@@ -49,7 +90,7 @@ async def save_readiness_to_db(env, pr_id, readiness_data):
         stale_feedback_json = json.dumps(review_health.get('stale_feedback', []))
         
         # Update the existing PR row with readiness data
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             UPDATE prs SET
                 overall_score = ?,
                 ci_score = ?,
@@ -110,7 +151,7 @@ async def load_readiness_from_db(env, pr_id):
         db = get_db(env)
         
         # Load PR data with readiness fields - explicitly select needed columns
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             SELECT id, title, author_login, repo_owner, repo_name, pr_number, 
                    state, is_merged, mergeable_state, files_changed,
                    checks_passed, checks_failed, checks_skipped,
@@ -218,6 +259,31 @@ async def load_readiness_from_db(env, pr_id):
         return None
 
 
+def build_clear_readiness_stmt(db, pr_id):
+    """Build the bound UPDATE that clears a PR's readiness columns without executing it"""
+    return prepared(db, '''
+        UPDATE prs SET
+            overall_score = NULL,
+            ci_score = NULL,
+            review_score = NULL,
+            classification = NULL,
+            merge_ready = NULL,
+            blockers = NULL,
+            warnings = NULL,
+            recommendations = NULL,
+            review_health_classification = NULL,
+            review_health_score = NULL,
+            response_rate = NULL,
+            total_feedback = NULL,
+            responded_feedback = NULL,
+            stale_feedback_count = NULL,
+            stale_feedback = NULL,
+            readiness_computed_at = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''').bind(pr_id)
+
+
 async def delete_readiness_from_db(env, pr_id):
     """Clear readiness analysis results from database (prs table).
     
@@ -229,28 +295,7 @@ async def delete_readiness_from_db(env, pr_id):
         db = get_db(env)
         
         # Clear readiness fields in the prs table
-        stmt = db.prepare('''
-            UPDATE prs SET
-                overall_score = NULL,
-                ci_score = NULL,
-                review_score = NULL,
-                classification = NULL,
-                merge_ready = NULL,
-                blockers = NULL,
-                warnings = NULL,
-                recommendations = NULL,
-                review_health_classification = NULL,
-                review_health_score = NULL,
-                response_rate = NULL,
-                total_feedback = NULL,
-                responded_feedback = NULL,
-                stale_feedback_count = NULL,
-                stale_feedback = NULL,
-                readiness_computed_at = NULL,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''')
-        await stmt.bind(pr_id).run()
+        await build_clear_readiness_stmt(db, pr_id).run()
         
         print(f"Database: Cleared readiness data for PR {pr_id}")
     except Exception as e:
@@ -258,37 +303,63 @@ async def delete_readiness_from_db(env, pr_id):
         # Don't raise - cache invalidation is already done
 
 
-async def upsert_pr(db, pr_url, owner, repo, pr_number, pr_data):
-    """Helper to insert or update PR in database (Deduplicates logic)"""
-    current_timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+# Statements per D1 batch() call when writing many rows at once
+_D1_BATCH_SIZE = 100
+
+
+async def run_batch(db, stmts):
+    """Execute bound statements with D1 batch(), one round-trip per _D1_BATCH_SIZE statements.
+    
+    Each batch runs as an implicit transaction in D1.
+    
+    Returns:
+        List of D1 results, one per statement in input order
+    """
+    results = []
+    for start in range(0, len(stmts), _D1_BATCH_SIZE):
+        results.extend(await db.batch(to_js(stmts[start:start + _D1_BATCH_SIZE])))
+    return results
+
+
+# Insert-or-update for a PR row, keyed on pr_url (shared by the upsert builders)
+_UPSERT_PR_SQL = '''
+    INSERT INTO prs (pr_url, repo_owner, repo_name, pr_number, title, state, 
+                   is_merged, mergeable_state, files_changed, author_login,                        author_avatar, repo_owner_avatar, checks_passed, checks_failed, checks_skipped, 
+                   commits_count, behind_by, review_status, last_updated_at, 
+                   last_refreshed_at, updated_at, is_draft, open_conversations_count, reviewers_json, etag)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(pr_url) DO UPDATE SET
+        title = excluded.title,
+        state = excluded.state,
+        is_merged = excluded.is_merged,
+        mergeable_state = excluded.mergeable_state,
+        files_changed = excluded.files_changed,
+        repo_owner_avatar = excluded.repo_owner_avatar,
+        checks_passed = excluded.checks_passed,
+        checks_failed = excluded.checks_failed,
+        checks_skipped = excluded.checks_skipped,
+        commits_count = excluded.commits_count,
+        behind_by = excluded.behind_by,
+        review_status = excluded.review_status,
+        last_updated_at = excluded.last_updated_at,
+        last_refreshed_at = excluded.last_refreshed_at,
+        updated_at = CURRENT_TIMESTAMP,
+        is_draft = excluded.is_draft,
+        open_conversations_count = excluded.open_conversations_count,
+        reviewers_json = excluded.reviewers_json,
+        etag = excluded.etag
+'''
+
+
+def build_upsert_stmt(db, pr_url, owner, repo, pr_number, pr_data, current_timestamp=None):
+    """Build the bound INSERT ... ON CONFLICT statement for a PR without executing it.
+    
+    Bulk callers pass one current_timestamp for every PR they write.
+    """
+    if current_timestamp is None:
+        current_timestamp = utc_now_iso()
     
-    stmt = db.prepare('''
-        INSERT INTO prs (pr_url, repo_owner, repo_name, pr_number, title, state, 
-                       is_merged, mergeable_state, files_changed, author_login,                        author_avatar, repo_owner_avatar, checks_passed, checks_failed, checks_skipped, 
-                       commits_count, behind_by, review_status, last_updated_at, 
-                       last_refreshed_at, updated_at, is_draft, open_conversations_count, reviewers_json, etag)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(pr_url) DO UPDATE SET
-            title = excluded.title,
-            state = excluded.state,
-            is_merged = excluded.is_merged,
-            mergeable_state = excluded.mergeable_state,
-            files_changed = excluded.files_changed,
-            repo_owner_avatar = excluded.repo_owner_avatar,
-            checks_passed = excluded.checks_passed,
-            checks_failed = excluded.checks_failed,
-            checks_skipped = excluded.checks_skipped,
-            commits_count = excluded.commits_count,
-            behind_by = excluded.behind_by,
-            review_status = excluded.review_status,
-            last_updated_at = excluded.last_updated_at,
-            last_refreshed_at = excluded.last_refreshed_at,
-            updated_at = CURRENT_TIMESTAMP,
-            is_draft = excluded.is_draft,
-            open_conversations_count = excluded.open_conversations_count,
-            reviewers_json = excluded.reviewers_json,
-            etag = excluded.etag
-    ''').bind(
+    return prepared(db, _UPSERT_PR_SQL).bind(
         pr_url, owner, repo, pr_number,
         pr_data.get('title') or '',
         pr_data.get('state') or '',
@@ -310,8 +381,67 @@ async def upsert_pr(db, pr_url, owner, repo, pr_number, pr_data):
         pr_data.get('reviewers_json') or '[]',
         pr_data.get('etag') or ''
     )
+
+
+# pr_data fields the upsert's DO UPDATE copies over unconverted, with the value
+# bound when the field is missing or falsy
+_REFRESHED_FIELD_DEFAULTS = (
+    ('title', ''), ('state', ''), ('mergeable_state', ''), ('files_changed', 0),
+    ('repo_owner_avatar', ''), ('checks_passed', 0), ('checks_failed', 0),
+    ('checks_skipped', 0), ('commits_count', 0), ('behind_by', 0), ('review_status', ''),
+    ('open_conversations_count', 0), ('reviewers_json', '[]'), ('etag', '')
+)
+
+
+def pr_row_unchanged(row, pr_data):
+    """True if upserting pr_data would only move the row's refresh timestamps.
     
-    await stmt.run()
+    Lets a refresh write build_touch_refreshed_stmt instead of rewriting the row.
+    """
+    if not pr_data.get('last_updated_at') or row.get('last_updated_at') != pr_data['last_updated_at']:
+        return False
+    if row.get('is_merged') != (1 if pr_data.get('is_merged') else 0):
+        return False
+    if row.get('is_draft') != (1 if pr_data.get('is_draft') else 0):
+        return False
+    for field, default in _REFRESHED_FIELD_DEFAULTS:
+        if row.get(field) != (pr_data.get(field) or default):
+            return False
+    return True
+
+
+def build_touch_refreshed_stmt(db, pr_id, current_timestamp=None):
+    """Build the UPDATE that only records a refresh of an otherwise unchanged PR"""
+    if current_timestamp is None:
+        current_timestamp = utc_now_iso()
+    
+    return prepared(db, '''
+        UPDATE prs SET last_refreshed_at = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''').bind(current_timestamp, pr_id)
+
+
+def build_listing_upsert_stmt(db, pr_url, owner, repo, pr_number, title, author_login,
+                              author_avatar, repo_owner_avatar, last_updated_at, is_draft, timestamp):
+    """Build the upsert for a PR known only from a /pulls listing.
+    
+    Checks, reviews and merge state aren't fetched for these yet, so those
+    columns get fixed placeholder values and the rest are bound positionally
+    (no intermediate pr_data dict per PR during bulk imports).
+    """
+    return prepared(db, _UPSERT_PR_SQL).bind(
+        pr_url, owner, repo, pr_number,
+        title, 'open', 0, 'unknown', 0,
+        author_login, author_avatar, repo_owner_avatar,
+        0, 0, 0, 0, 0, 'pending',
+        last_updated_at, timestamp, timestamp,
+        is_draft, 0, '[]', ''
+    )
+
+
+async def upsert_pr(db, pr_url, owner, repo, pr_number, pr_data, current_timestamp=None):
+    """Helper to insert or update PR in database (Deduplicates logic)"""
+    await build_upsert_stmt(db, pr_url, owner, repo, pr_number, pr_data, current_timestamp).run()
 
 
 async def save_timeline_to_db(env, owner, repo, pr_number, data):
@@ -328,7 +458,7 @@ async def save_timeline_to_db(env, owner, repo, pr_number, data):
         db = get_db(env)
         current_time = str(time.time())
         
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             INSERT INTO timeline_cache (owner, repo, pr_number, data, timestamp)
             VALUES (?, ?, ?, ?, ?)
             ON CONFLICT(owner, repo, pr_number) DO UPDATE SET
@@ -356,7 +486,7 @@ async def load_timeline_from_db(env, owner, repo, pr_number):
     """
     try:
         db = get_db(env)
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             SELECT data, timestamp FROM timeline_cache 
             WHERE owner = ? AND repo = ? AND pr_number = ?
         ''').bind(owner, repo, pr_number)
@@ -372,6 +502,14 @@ async def load_timeline_from_db(env, owner, repo, pr_number):
         return None, None
 
 
+def build_delete_timeline_stmt(db, owner, repo, pr_number):
+    """Build the bound DELETE for a PR's stored timeline without executing it"""
+    return prepared(db, '''
+        DELETE FROM timeline_cache 
+        WHERE owner = ? AND repo = ? AND pr_number = ?
+    ''').bind(owner, repo, pr_number)
+
+
 async def delete_timeline_from_db(env, owner, repo, pr_number):
     """Delete timeline data from D1 database.
     
@@ -383,12 +521,7 @@ async def delete_timeline_from_db(env, owner, repo, pr_number):
     """
     try:
         db = get_db(env)
-        stmt = db.prepare('''
-            DELETE FROM timeline_cache 
-            WHERE owner = ? AND repo = ? AND pr_number = ?
-        ''').bind(owner, repo, pr_number)
-        
-        await stmt.run()
+        await build_delete_timeline_stmt(db, owner, repo, pr_number).run()
         print(f"Database: Deleted timeline cache for {owner}/{repo}#{pr_number}")
     except Exception as e:
         print(f"Error deleting timeline from database for {owner}/{repo}#{pr_number}: {str(e)}")
@@ -1,10 +1,70 @@
 """GitHub API interactions"""
 
 import json
+import re
+import sys
 import asyncio
-from js import fetch, Object
+from js import fetch, Object, crypto
 from pyodide.ffi import to_js
-from cache import get_timeline_cache, set_timeline_cache, set_rate_limit_data
+from cache import (
+    get_timeline_cache, set_timeline_cache, set_rate_limit_data,
+    get_etag_cache, set_etag_cache
+)
+
+
+# Check-run conclusion -> index into the [passed, failed, skipped] tally
+# Conclusions not listed here (e.g. null for in-progress runs) are not counted
+_CHECK_BUCKET = {
+    'success': 0,
+    'failure': 1,
+    'timed_out': 1,
+    'cancelled': 1,
+    'skipped': 2,
+    'neutral': 2
+}
+
+# Converted JS headers/options keyed by the static header set that produced them.
+# to_js crosses the Python/JS boundary for every key, and the same few static
+# header sets are reused for nearly every GitHub call. Per-call headers (the
+# caller's token, per-URL validators) are kept out of the key and layered on for
+# each request, so the memo stays small and never holds credentials.
+_fetch_options_cache = {}
+_FETCH_OPTIONS_CACHE_MAX_ENTRIES = 16
+_PER_CALL_HEADERS = ('Authorization', 'If-None-Match')
+
+
+def _get_fetch_options(headers):
+    """Return JS fetch options for a GET, reusing the converted static headers"""
+    if not isinstance(headers, dict):
+        return to_js({
+            "method": "GET",
+            "headers": headers
+        }, dict_converter=Object.fromEntries)
+    
+    per_call = {name: headers[name] for name in _PER_CALL_HEADERS if name in headers}
+    static = {k: v for k, v in headers.items() if k not in per_call} if per_call else headers
+    
+    key = frozenset(static.items())
+    cached = _fetch_options_cache.get(key)
+    if cached is None:
+        static_js = to_js(static, dict_converter=Object.fromEntries)
+        cached = (static_js, to_js({
+            "method": "GET",
+            "headers": static_js
+        }, dict_converter=Object.fromEntries))
+        if len(_fetch_options_cache) >= _FETCH_OPTIONS_CACHE_MAX_ENTRIES:
+            del _fetch_options_cache[next(iter(_fetch_options_cache))]
+        _fetch_options_cache[key] = cached
+    
+    static_js, options = cached
+    if not per_call:
+        return options
+    # Copy the static headers and add this call's ones; the cached objects are never mutated
+    merged = Object.assign(Object.new(), static_js, to_js(per_call, dict_converter=Object.fromEntries))
+    return to_js({
+        "method": "GET",
+        "headers": merged
+    }, dict_converter=Object.fromEntries)
 
 
 async def fetch_with_headers(url, headers=None, token=None):
@@ -17,10 +77,7 @@ async def fetch_with_headers(url, headers=None, token=None):
     if token:
         headers['Authorization'] = f'Bearer {token}'
 
-    options = to_js({
-        "method": "GET",
-        "headers": headers
-    }, dict_converter=Object.fromEntries)
+    options = _get_fetch_options(headers)
     
     response = await fetch(url, options)
     
@@ -39,6 +96,61 @@ async def fetch_with_headers(url, headers=None, token=None):
     return response
 
 
+def _extract_check_runs(checks_js):
+    """Read just the conclusions from a check-runs payload without converting the whole tree"""
+    return {'check_runs': [{'conclusion': run.conclusion} for run in checks_js.check_runs]}
+
+
+def _extract_compare(compare_js):
+    """
+    Read the branch divergence counts from a compare payload.
+    
+    The compare response embeds up to 250 commits and 300 files that we never
+    use, so reading three fields off the JsProxy avoids converting all of it.
+    """
+    return {
+        'ahead_by': compare_js.ahead_by,
+        'behind_by': compare_js.behind_by,
+        'status': compare_js.status
+    }
+
+
+async def fetch_json_with_etag(url, token=None, extract=None):
+    """
+    GET a GitHub JSON resource, revalidating any cached copy with If-None-Match.
+    
+    Args:
+        url: GitHub API URL
+        token: Optional GitHub token
+        extract: Optional function reading the needed fields from the JsProxy
+                 response body. Defaults to a full .to_py() conversion.
+    
+    Returns (status, data). A 304 Not Modified is reported as (200, cached data)
+    so callers don't need to distinguish it; data is None for non-200 responses.
+    """
+    headers = {
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28'
+    }
+    cached = get_etag_cache(url, token)
+    if cached:
+        headers['If-None-Match'] = cached['etag']
+    
+    response = await fetch_with_headers(url, headers, token)
+    
+    if response.status == 304 and cached:
+        return 200, cached['data']
+    if response.status != 200:
+        return response.status, None
+    
+    body = await response.json()
+    data = extract(body) if extract else body.to_py()
+    etag = response.headers.get('etag')
+    if etag:
+        set_etag_cache(url, token, etag, data, len(data) if isinstance(data, list) else 1)
+    return 200, data
+
+
 async def fetch_open_conversations_count(owner, repo, pr_number, token=None):
     """
     Fetch count of unresolved review conversations (threads) using GitHub GraphQL API.
@@ -160,8 +272,14 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
     
     Optimizations applied:
     - Conditional requests (ETags): Avoid fetching if data hasn't changed
+    - Checks, compare, and reviews are revalidated per URL, so unchanged
+      endpoints return 304 and reuse the cached body
     - Files list is NOT fetched since PR details already include 'changed_files' count
     - Checks, compare, and reviews API calls are made in parallel for efficiency
+    - Reviews and open conversations start alongside the PR fetch when no ETag
+      is supplied, taking them off the critical path
+    - Merged/closed PRs return right after the PR fetch, skipping checks and compare
+      and cancelling the reviews/conversations fetches
     """
     headers = {
         'Accept': 'application/vnd.github+json',
@@ -170,12 +288,30 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
     
     if etag:
         headers['If-None-Match'] = etag
-        
+    
+    independent_fetches = None
     try:
-        # Fetch PR details first (needed for head SHA)
         pr_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
+        reviews_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews?per_page=100"
+        
+        # Open conversations and reviews don't depend on the PR payload, so start
+        # them alongside the PR fetch. Skipped for conditional requests, where a
+        # 304 on the PR would make them wasted calls.
+        if not etag:
+            independent_fetches = asyncio.gather(
+                fetch_open_conversations_count(owner, repo, pr_number, token),
+                fetch_json_with_etag(reviews_url, token),
+                return_exceptions=True
+            )
+        
+        # Fetch PR details first (needed for head SHA)
         pr_response = await fetch_with_headers(pr_url, headers, token)
         
+        if pr_response.status != 200 and independent_fetches is not None:
+            # Nothing will consume these results; wait for them so no
+            # request is left dangling when the worker responds
+            await independent_fetches
+        
         # Handle 304 Not Modified
         if pr_response.status == 304:
             print(f"GitHub API: PR #{pr_number} returned 304 Not Modified (Fast-path)")
@@ -191,18 +327,45 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
         
         # Extract new ETag for storage
         new_etag = pr_response.headers.get('etag')
+        
+        # Merged/closed PRs are rejected on add and dropped on refresh, so the
+        # checks and compare calls would be wasted. Return the PR details only.
+        if pr_data.get('merged') or pr_data.get('state') == 'closed':
+            if independent_fetches is not None:
+                # Their results would be discarded: cancel them, then collect the
+                # cancellation so it isn't reported as an unretrieved exception
+                independent_fetches.cancel()
+                await asyncio.gather(independent_fetches, return_exceptions=True)
+            user = pr_data.get('user') or {}
+            return {
+                'title': pr_data.get('title', ''),
+                'state': pr_data.get('state', ''),
+                'is_merged': 1 if pr_data.get('merged', False) else 0,
+                'repo_private': bool(pr_data.get('base', {}).get('repo', {}).get('private', False)),
+                'mergeable_state': pr_data.get('mergeable_state', ''),
+                'files_changed': pr_data.get('changed_files', 0),
+                'author_login': user.get('login', 'ghost'),
+                'author_avatar': user.get('avatar_url', ''),
+                'repo_owner_avatar': pr_data.get('base', {}).get('repo', {}).get('owner', {}).get('avatar_url', ''),
+                'checks_passed': 0,
+                'checks_failed': 0,
+                'checks_skipped': 0,
+                'commits_count': pr_data.get('commits', 0),
+                'behind_by': 0,
+                'review_status': 'pending',
+                'last_updated_at': pr_data.get('updated_at', ''),
+                'is_draft': 1 if pr_data.get('draft', False) else 0,
+                'open_conversations_count': 0,
+                'reviewers_json': '[]',
+                'etag': new_etag
+            }
 
         # Prepare URLs for parallel fetching
-        # We MUST NOT send If-None-Match to these secondary calls based on the PR etag,
-        # as each endpoint has its own etag logic. We just want to clear headers.
-        secondary_headers = {
-            'Accept': 'application/vnd.github+json',
-            'X-GitHub-Api-Version': '2022-11-28'
-        }
+        # We MUST NOT send the PR etag to these secondary calls, as each endpoint
+        # has its own etag logic. fetch_json_with_etag tracks a validator per URL.
         # Note: We don't fetch files list since pr_data already includes 'changed_files' count
         # Reviews are fetched here to extract per-reviewer approval data (login + avatar)
         checks_url = f"https://api.github.com/repos/{owner}/{repo}/commits/{pr_data['head']['sha']}/check-runs"
-        reviews_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews?per_page=100"
         
         # Extract base and head branch information for comparison
         # To check if PR is behind base, we need to compare the branches (not SHAs)
@@ -231,25 +394,31 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
         open_conversations_count = 0
         
         try:
+            if independent_fetches is None:
+                independent_fetches = asyncio.gather(
+                    fetch_open_conversations_count(owner, repo, pr_number, token),
+                    fetch_json_with_etag(reviews_url, token),
+                    return_exceptions=True
+                )
             results = await asyncio.gather(
-                fetch_with_headers(checks_url, secondary_headers, token),
-                fetch_with_headers(compare_url, secondary_headers, token),
-                fetch_open_conversations_count(owner, repo, pr_number, token),
-                fetch_with_headers(reviews_url, secondary_headers, token),
+                fetch_json_with_etag(checks_url, token, _extract_check_runs),
+                fetch_json_with_etag(compare_url, token, _extract_compare),
                 return_exceptions=True
             )
+            # results: [checks, compare, open conversations, reviews]
+            results += await independent_fetches
             
             # Process checks result
-            if not isinstance(results[0], Exception) and results[0].status == 200:
-                checks_data = (await results[0].json()).to_py()
+            if not isinstance(results[0], Exception) and results[0][0] == 200:
+                checks_data = results[0][1]
             
             # Process compare result
-            if not isinstance(results[1], Exception) and results[1].status == 200:
-                compare_data = (await results[1].json()).to_py()
+            if not isinstance(results[1], Exception) and results[1][0] == 200:
+                compare_data = results[1][1]
                 print(f"Compare API success for PR #{pr_number}")
             elif not isinstance(results[1], Exception):
                 # Log error if compare API fails
-                print(f"Compare API failed for PR #{pr_number} with status {results[1].status}, URL: {compare_url}")
+                print(f"Compare API failed for PR #{pr_number} with status {results[1][0]}, URL: {compare_url}")
             else:
                 print(f"Compare API exception for PR #{pr_number}: {results[1]}")
             
@@ -260,26 +429,20 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
                 print(f"Open conversations fetch exception for PR #{pr_number}: {results[2]}")
             
             # Process reviews result
-            if not isinstance(results[3], Exception) and results[3].status == 200:
-                reviews_data = (await results[3].json()).to_py()
+            if not isinstance(results[3], Exception) and results[3][0] == 200:
+                reviews_data = results[3][1]
             else:
                 print(f"Reviews fetch failed for PR #{pr_number}")
         except Exception as e:
             print(f"Error fetching PR data for #{pr_number}: {str(e)}")
         
         # Process check runs
-        checks_passed = 0
-        checks_failed = 0
-        checks_skipped = 0
-        
-        if 'check_runs' in checks_data:
-            for check in checks_data['check_runs']:
-                if check['conclusion'] == 'success':
-                    checks_passed += 1
-                elif check['conclusion'] in ['failure', 'timed_out', 'cancelled']:
-                    checks_failed += 1
-                elif check['conclusion'] in ['skipped', 'neutral']:
-                    checks_skipped += 1
+        check_counts = [0, 0, 0]
+        for check in checks_data.get('check_runs', ()):
+            bucket = _CHECK_BUCKET.get(check['conclusion'])
+            if bucket is not None:
+                check_counts[bucket] += 1
+        checks_passed, checks_failed, checks_skipped = check_counts
         
         # Get commits count from pr_data (GitHub provides this)
         commits_count = pr_data.get('commits', 0)
@@ -293,23 +456,20 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
             behind_by = compare_data.get('ahead_by') or 0
             print(f"PR #{pr_number}: Compare status={compare_data.get('status')}, ahead_by={compare_data.get('ahead_by')}, behind_by={compare_data.get('behind_by')}")
         
-        # Calculate review status from reviews data
-        from utils import calculate_review_status
-        review_status = calculate_review_status(reviews_data)
-        
-        # Build per-reviewer data for the Approvals column - Keep only the latest review state per reviewer
-        latest_reviews = {}
-        if reviews_data:
-            valid_reviews = [r for r in reviews_data if r.get('submitted_at') and r.get('user')]
-            sorted_reviews = sorted(valid_reviews, key=lambda x: x.get('submitted_at', ''))
-            for review in sorted_reviews:
-                user = review['user']
-                latest_reviews[user['login']] = {
-                    'login': user['login'],
-                    'avatar_url': user.get('avatar_url', ''),
-                    'state': review['state']  # APPROVED, CHANGES_REQUESTED, COMMENTED, etc.
-                }
-        reviewers_list = list(latest_reviews.values())
+        # Keep only the latest review state per reviewer (single pass, no sort)
+        from utils import get_latest_reviews, calculate_review_status
+        latest_reviews = get_latest_reviews(reviews_data)
+        review_status = calculate_review_status(reviews_data, latest_reviews)
+        
+        # Build per-reviewer data for the Approvals column
+        reviewers_list = [
+            {
+                'login': login,
+                'avatar_url': review['user'].get('avatar_url', ''),
+                'state': sys.intern(review['state'])  # APPROVED, CHANGES_REQUESTED, COMMENTED, etc.
+            }
+            for login, review in latest_reviews.items()
+        ]
         
         # Safely access user fields - user can be null for deleted accounts
         user = pr_data.get('user') or {}
@@ -337,6 +497,10 @@ async def fetch_pr_data(owner, repo, pr_number, token=None, etag=None):
             'etag': new_etag
         }
     except Exception as e:
+        # A failure before the parallel fetches were consumed (PR fetch raised,
+        # malformed payload) must not leave them running unobserved
+        if independent_fetches is not None and not independent_fetches.done():
+            await independent_fetches
         # Return more informative error for debugging
         error_msg = f"Error fetching PR data: {str(e)}"
         # In Cloudflare Workers, console.error is preferred
@@ -351,7 +515,7 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
     Instead of making 4-5 REST API calls per PR, we make 1 GraphQL call for all PRs.
     
     IMPORTANT TRADEOFFS:
-    - Does not fetch check run status (checks_passed/failed/skipped) - set to 0
+    - Check runs come from the head commit's statusCheckRollup (first 100 contexts)
     - Does not fetch behind_by count - set to 0
     - No ETag support for conditional requests
     - Limited to first 100 review threads per PR
@@ -405,6 +569,21 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
                                 avatarUrl
                             }}
                         }}
+                        lastCommit: commits(last: 1) {{
+                            nodes {{
+                                commit {{
+                                    statusCheckRollup {{
+                                        contexts(first: 100) {{
+                                            nodes {{
+                                                ... on CheckRun {{
+                                                    conclusion
+                                                }}
+                                            }}
+                                        }}
+                                    }}
+                                }}
+                            }}
+                        }}
                         headRefOid
                         baseRefName
                         headRefName
@@ -495,10 +674,9 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
                     continue
                 
                 # Transform GraphQL response to match REST API format used by fetch_pr_data
-                # Note: Some fields (checks_passed, checks_failed, checks_skipped, behind_by) 
-                # are not available in this batch GraphQL query to keep it simple and fast.
-                # These fields are set to 0 and marked with _incomplete_data flag.
-                # For critical updates where these fields matter, use individual fetch_pr_data() instead.
+                # Note: behind_by is not available in this batch GraphQL query to keep it
+                # simple and fast. It is set to 0 and listed in _incomplete_fields.
+                # For critical updates where it matters, use individual fetch_pr_data() instead.
                 author = pr_data.get('author', {})
                 base_repo = pr_data.get('baseRepository', {})
                 
@@ -512,24 +690,42 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
                 if page_info.get('hasNextPage'):
                     print(f"Warning: PR {owner}/{repo}#{pr_number} has >100 review threads, count may be incomplete")
                 
-                # Process reviews to get latest state per reviewer
-                from utils import calculate_review_status
-                reviews_data = pr_data.get('reviews', {}).get('nodes', [])
-                review_status = calculate_review_status(reviews_data)
+                # Tally head-commit check runs the same way fetch_pr_data does; GraphQL
+                # conclusions are upper-case enums, and legacy status contexts (which
+                # the REST check-runs endpoint omits) carry no conclusion
+                check_counts = [0, 0, 0]
+                for commit_node in pr_data.get('lastCommit', {}).get('nodes', []):
+                    rollup = (commit_node.get('commit') or {}).get('statusCheckRollup') or {}
+                    for context in rollup.get('contexts', {}).get('nodes', []):
+                        conclusion = context.get('conclusion')
+                        if conclusion:
+                            bucket = _CHECK_BUCKET.get(conclusion.lower())
+                            if bucket is not None:
+                                check_counts[bucket] += 1
                 
-                # Build per-reviewer data
+                # Latest review per reviewer in one pass (no sort): ISO 8601
+                # timestamps compare chronologically as strings, and '>=' lets
+                # the later entry win ties
+                from utils import calculate_review_status
                 latest_reviews = {}
-                if reviews_data:
-                    valid_reviews = [r for r in reviews_data if r.get('submittedAt') and r.get('author')]
-                    sorted_reviews = sorted(valid_reviews, key=lambda x: x.get('submittedAt', ''))
-                    for review in sorted_reviews:
-                        author_data = review['author']
-                        latest_reviews[author_data['login']] = {
-                            'login': author_data['login'],
+                latest_submitted = {}
+                for review in pr_data.get('reviews', {}).get('nodes', []):
+                    submitted_at = review.get('submittedAt')
+                    author_data = review.get('author')
+                    if not submitted_at or not author_data:
+                        continue
+                    login = author_data['login']
+                    if login not in latest_submitted or submitted_at >= latest_submitted[login]:
+                        latest_submitted[login] = submitted_at
+                        latest_reviews[login] = {
+                            'login': login,
                             'avatar_url': author_data.get('avatarUrl', ''),
-                            'state': review['state']
+                            'state': sys.intern(review['state'])
                         }
                 reviewers_list = list(latest_reviews.values())
+                # GraphQL review nodes use author/submittedAt rather than the REST
+                # user/submitted_at keys, so pass the per-reviewer states directly
+                review_status = calculate_review_status(None, latest_reviews)
                 
                 # Build the pr_data dict matching REST API format
                 transformed_data = {
@@ -541,9 +737,9 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
                     'author_login': author.get('login', ''),
                     'author_avatar': author.get('avatarUrl', ''),
                     'repo_owner_avatar': base_repo.get('owner', {}).get('avatarUrl', ''),
-                    'checks_passed': 0,  # Not available in batch query
-                    'checks_failed': 0,  # Not available in batch query
-                    'checks_skipped': 0,  # Not available in batch query
+                    'checks_passed': check_counts[0],
+                    'checks_failed': check_counts[1],
+                    'checks_skipped': check_counts[2],
                     'commits_count': pr_data.get('commits', {}).get('totalCount', 0),
                     'behind_by': 0,  # Not available in batch query
                     'review_status': review_status,
@@ -553,7 +749,7 @@ async def fetch_multiple_prs_batch(prs_to_fetch, token=None):
                     'reviewers_json': json.dumps(reviewers_list),
                     'etag': None,  # GraphQL doesn't provide ETags
                     '_batch_fetch': True,  # Mark as batch-fetched (incomplete data)
-                    '_incomplete_fields': ['checks_passed', 'checks_failed', 'checks_skipped', 'behind_by']
+                    '_incomplete_fields': ['behind_by']
                 }
                 
                 all_results[(owner, repo, pr_number)] = transformed_data
@@ -632,17 +828,100 @@ async def fetch_org_repos(owner, token=None, max_repos=200):
     raise Exception(f"Could not find GitHub organization or user: {owner}")
 
 
-async def fetch_paginated_data(url, headers_dict, github_token=None, max_items=None, return_metadata=False):
+# Maximum number of pages fetched concurrently once the page count is known
+_PAGINATION_CONCURRENCY = 6
+
+_PAGE_PARAM_RE = re.compile(r'([?&]page=)(\d+)')
+
+
+def _parse_link_header(link_header):
+    """Parse a GitHub Link header into a {rel: url} dict"""
+    links = {}
+    if not link_header:
+        return links
+    for link in link_header.split(','):
+        segments = link.split(';')
+        url_part = segments[0].strip()
+        if not (url_part.startswith('<') and url_part.endswith('>')):
+            continue
+        for segment in segments[1:]:
+            segment = segment.strip()
+            if segment.startswith('rel='):
+                links[segment[4:].strip('"')] = url_part[1:-1]
+    return links
+
+
+def _remaining_page_urls(next_url, last_url):
+    """
+    Build the URLs for every page from rel="next" through rel="last".
+    
+    Returns an empty list if the page numbers cannot be read from the URLs,
+    in which case the caller falls back to following rel="next" links.
+    """
+    next_match = _PAGE_PARAM_RE.search(next_url)
+    last_match = _PAGE_PARAM_RE.search(last_url)
+    if not next_match or not last_match:
+        return []
+    first_page = int(next_match.group(2))
+    last_page = int(last_match.group(2))
+    return [
+        _PAGE_PARAM_RE.sub(lambda m, page=page: f'{m.group(1)}{page}', next_url, count=1)
+        for page in range(first_page, last_page + 1)
+    ]
+
+
+async def _fetch_page(url, headers_dict, github_token=None, revalidate=False):
+    """
+    Fetch a single page of a paginated endpoint. Returns (items, links)
+    
+    With revalidate=True a previously seen page is requested with If-None-Match,
+    and a 304 (which costs no rate limit) returns the cached page.
+    """
+    cached = None
+    if revalidate:
+        cache_token = github_token or headers_dict.get('Authorization')
+        cached = get_etag_cache(url, cache_token)
+        if cached:
+            # Copy: the same header dict is shared by concurrent page fetches
+            headers_dict = {**headers_dict, 'If-None-Match': cached['etag']}
+    
+    response = await fetch_with_headers(url, headers_dict, github_token)
+    
+    if response.status == 304 and cached:
+        return cached['data']
+    if not response.ok:
+        status = getattr(response, 'status', 'unknown')
+        status_text = getattr(response, 'statusText', '')
+        raise Exception(
+            f"GitHub API error: status={status} {status_text} url={url}"
+        )
+    
+    page = ((await response.json()).to_py(), _parse_link_header(response.headers.get('link')))
+    if revalidate:
+        etag = response.headers.get('etag')
+        if etag:
+            set_etag_cache(url, cache_token, etag, page, max(len(page[0]), 1))
+    return page
+
+
+async def fetch_paginated_data(url, headers_dict, github_token=None, max_items=None, return_metadata=False,
+                                revalidate=False):
     """
     Fetch all pages of data from a GitHub API endpoint following Link headers
     
+    When the first response advertises rel="last", the remaining pages are
+    fetched concurrently (bounded by _PAGINATION_CONCURRENCY) instead of one
+    round-trip at a time. Otherwise rel="next" links are followed sequentially.
+    
     Args:
         url: Initial URL to fetch
-        headers: Headers object to use for requests
+        headers_dict: Header dict to use for requests
         max_items: Optional maximum number of items to fetch (default: unlimited).
                   Must be None or a positive integer.
         return_metadata: If True, returns dict with items, truncated, and total_fetched.
                         If False (default), returns just the list of items for backward compatibility.
+        revalidate: If True, pages are revalidated with cached ETags (see _fetch_page).
+                    Meant for small, frequently re-read endpoints such as PR timelines.
     
     Returns:
         If return_metadata=False: List of all items fetched
@@ -656,67 +935,61 @@ async def fetch_paginated_data(url, headers_dict, github_token=None, max_items=N
         raise ValueError(f"max_items must be None or a positive integer, got: {max_items}")
     
     all_data = []
-    current_url = url
     truncated = False
     
-    while current_url:
-        response = await fetch_with_headers(current_url, headers_dict, github_token)
-        
-        # Log GitHub API call with rate limit information
-        # Check if URL starts with GitHub API domain for logging purposes only
-        if current_url.startswith('https://api.github.com/'):
-            rate_limit = response.headers.get('x-ratelimit-limit')
-            rate_remaining = response.headers.get('x-ratelimit-remaining')
-            rate_reset = response.headers.get('x-ratelimit-reset')
-            print(f"GitHub API: {current_url} | Status: {response.status} | Rate Limit: {rate_remaining}/{rate_limit} remaining | Reset: {rate_reset}")
+    def add_page(page_data, has_next_page):
+        """Append a page, honouring max_items. Returns True once the limit is hit"""
+        nonlocal truncated
+        if max_items is None:
+            all_data.extend(page_data)
+            return False
         
-        if not response.ok:
-            status = getattr(response, 'status', 'unknown')
-            status_text = getattr(response, 'statusText', '')
-            raise Exception(
-                f"GitHub API error: status={status} {status_text} url={current_url}"
-            )
+        items_to_add = min(len(page_data), max_items - len(all_data))
+        all_data.extend(page_data[:items_to_add])
         
-        page_data = (await response.json()).to_py()
+        if len(all_data) >= max_items:
+            # Only mark as truncated if there's actually more data available
+            if has_next_page or items_to_add < len(page_data):
+                truncated = True
+            print(f"Pagination limit reached: {len(all_data)} items (max: {max_items})")
+            return True
+        return False
+    
+    page_data, links = await _fetch_page(url, headers_dict, github_token, revalidate)
+    current_url = None
+    
+    # Break early if we receive an empty page (end of results)
+    if page_data and not add_page(page_data, 'next' in links):
+        current_url = links.get('next')
+    
+    # GitHub told us how many pages there are: fetch the rest concurrently
+    page_urls = _remaining_page_urls(current_url, links['last']) if current_url and 'last' in links else []
+    if page_urls:
+        if max_items is not None:
+            # Don't request pages we already know will be discarded
+            pages_needed = -(-(max_items - len(all_data)) // len(page_data))
+            page_urls = page_urls[:pages_needed]
         
-        # Break early if we receive an empty page (end of results)
-        if not page_data:
-            break
+        semaphore = asyncio.Semaphore(_PAGINATION_CONCURRENCY)
         
-        # Check for Link header to get next page (needed for truncation logic)
-        link_header = response.headers.get('link')
-        has_next_page = False
-        if link_header:
-            links = link_header.split(',')
-            for link in links:
-                if 'rel="next"' in link:
-                    has_next_page = True
-                    break
+        async def fetch_bounded(page_url):
+            async with semaphore:
+                return await _fetch_page(page_url, headers_dict, github_token, revalidate)
         
-        # Check if adding this page would exceed max_items
-        if max_items is not None:
-            items_to_add = min(len(page_data), max_items - len(all_data))
-            all_data.extend(page_data[:items_to_add])
-            
-            if len(all_data) >= max_items:
-                # Only mark as truncated if there's actually more data available
-                if has_next_page or items_to_add < len(page_data):
-                    truncated = True
-                print(f"Pagination limit reached: {len(all_data)} items (max: {max_items})")
+        pages = await asyncio.gather(*[fetch_bounded(page_url) for page_url in page_urls])
+        for page_data, page_links in pages:
+            current_url = None
+            if not page_data or add_page(page_data, 'next' in page_links):
                 break
-        else:
-            all_data.extend(page_data)
-        
-        # Determine URL for next page, if any
-        current_url = None
-        if has_next_page:
-            # Extract URL from <url>
-            for link in links:
-                if 'rel="next"' in link:
-                    url_match = link.split(';')[0].strip()
-                    if url_match.startswith('<') and url_match.endswith('>'):
-                        current_url = url_match[1:-1]
-                    break
+            # The PR may have grown while we were fetching
+            current_url = page_links.get('next')
+    
+    # Sequential fallback when no usable rel="last" link is present
+    while current_url:
+        page_data, links = await _fetch_page(current_url, headers_dict, github_token, revalidate)
+        if not page_data or add_page(page_data, 'next' in links):
+            break
+        current_url = links.get('next')
     
     if return_metadata:
         return {
@@ -733,7 +1006,8 @@ async def fetch_pr_timeline_data(env, owner, repo, pr_number, github_token=None)
     Fetch all timeline data for a PR: commits, reviews, review comments, issue comments
     
     Uses in-memory caching (30 min TTL) with D1 fallback to avoid redundant API calls.
-    All 4 API calls are made in parallel for optimal performance.
+    All 4 API calls are made in parallel for optimal performance. After the
+    timeline cache is invalidated, unchanged pages come back as free 304s.
     
     Note: Reviews are fetched here (not in fetch_pr_data) to avoid duplication.
     
@@ -771,10 +1045,10 @@ async def fetch_pr_timeline_data(env, owner, repo, pr_number, github_token=None)
         
         # Make truly parallel requests using asyncio.gather
         commits_data, reviews_data, review_comments_data, issue_comments_data = await asyncio.gather(
-            fetch_paginated_data(commits_url, headers_dict, github_token),
-            fetch_paginated_data(reviews_url, headers_dict, github_token),
-            fetch_paginated_data(review_comments_url, headers_dict, github_token),
-            fetch_paginated_data(issue_comments_url, headers_dict, github_token)
+            fetch_paginated_data(commits_url, headers_dict, github_token, revalidate=True),
+            fetch_paginated_data(reviews_url, headers_dict, github_token, revalidate=True),
+            fetch_paginated_data(review_comments_url, headers_dict, github_token, revalidate=True),
+            fetch_paginated_data(issue_comments_url, headers_dict, github_token, revalidate=True)
         )
         
         timeline_data = {
@@ -792,6 +1066,31 @@ async def fetch_pr_timeline_data(env, owner, repo, pr_number, github_token=None)
         raise Exception(f"Error fetching timeline data: {str(e)}")
 
 
+# Imported HMAC key for the webhook secret, reused across invocations
+_webhook_key_secret = None
+_webhook_hmac_key = None
+
+
+async def _get_webhook_hmac_key(secret):
+    """Import (once per secret) the SubtleCrypto HMAC-SHA256 key for webhook verification"""
+    global _webhook_key_secret, _webhook_hmac_key
+    
+    if _webhook_hmac_key is not None and _webhook_key_secret == secret:
+        return _webhook_hmac_key
+    
+    key = await crypto.subtle.importKey(
+        'raw',
+        to_js(secret.encode('utf-8')),
+        to_js({'name': 'HMAC', 'hash': 'SHA-256'}, dict_converter=Object.fromEntries),
+        False,
+        to_js(['verify'])
+    )
+    
+    _webhook_key_secret = secret
+    _webhook_hmac_key = key
+    return key
+
+
 async def verify_github_signature(request, payload_body, secret):
     """
     Verify GitHub webhook signature.
@@ -814,20 +1113,22 @@ async def verify_github_signature(request, payload_body, secret):
         return False
     
     # GitHub sends signature as "sha256=<hash>"
+    if not signature_header.startswith('sha256='):
+        return False
+    try:
+        signature = bytes.fromhex(signature_header[7:])
+    except ValueError:
+        return False
+    
     try:
-        import hashlib
-        import hmac
-        
         # Ensure payload_body is bytes
         if isinstance(payload_body, str):
             payload_body = payload_body.encode('utf-8')
         
-        # Calculate expected signature
-        hash_object = hmac.new(secret.encode('utf-8'), msg=payload_body, digestmod=hashlib.sha256)
-        expected_signature = "sha256=" + hash_object.hexdigest()
-        
-        # Constant-time comparison to prevent timing attacks
-        return hmac.compare_digest(expected_signature, signature_header)
+        # SubtleCrypto runs HMAC natively instead of in WASM, and verify()
+        # compares in constant time to prevent timing attacks
+        key = await _get_webhook_hmac_key(secret)
+        return bool(await crypto.subtle.verify('HMAC', key, to_js(signature), to_js(payload_body)))
     except Exception as e:
         print(f"Error verifying webhook signature: {e}")
         return False
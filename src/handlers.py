@@ -1,24 +1,30 @@
 """API endpoint handlers for PR tracking"""
 
+import asyncio
 import json
 import re
 from datetime import datetime, timezone
-from js import Response, Headers, Object
+from js import Response, Object, JSON
 from pyodide.ffi import to_js
 
 # Import from our modules
 from utils import (
     parse_pr_url, parse_repo_url, parse_org_url, calculate_review_status,
     build_pr_timeline, analyze_review_progress, classify_review_health,
-    calculate_pr_readiness
+    calculate_pr_readiness, utc_now_iso, get_client_ip
 )
 from cache import (
-    check_rate_limit, get_readiness_cache, set_readiness_cache,
+    check_rate_limit, get_readiness_cache_body, set_readiness_cache,
     invalidate_readiness_cache, invalidate_timeline_cache, get_rate_limit_cache,
+    evict_readiness_cache, evict_timeline_cache,
     _READINESS_CACHE_TTL, _RATE_LIMIT_CACHE_TTL, _READINESS_RATE_LIMIT,
     _READINESS_RATE_WINDOW, _rate_limit_cache
 )
-from database import get_db, upsert_pr
+from database import (
+    get_db, prepared, upsert_pr, build_upsert_stmt, build_listing_upsert_stmt, run_batch,
+    build_clear_readiness_stmt, build_delete_timeline_stmt, build_touch_refreshed_stmt,
+    pr_row_unchanged
+)
 from github_api import (
     fetch_pr_data, fetch_pr_timeline_data, fetch_paginated_data,
     verify_github_signature, fetch_multiple_prs_batch, fetch_org_repos
@@ -31,9 +37,155 @@ from slack_notifier import notify_slack_exception, notify_slack_error
 # Uses COALESCE to handle NULL values (returns 0 if column is NULL or invalid JSON)
 ISSUES_COUNT_SQL_EXPR = '(COALESCE(json_array_length(blockers), 0) + COALESCE(json_array_length(warnings), 0))'
 
+# Columns the dashboard reads from GET /api/prs: every prs column except the
+# bookkeeping ones (etag, created_at, updated_at) it never displays
+_PR_LIST_COLUMNS = (
+    'id, pr_url, repo_owner, repo_name, pr_number, title, state, is_merged, '
+    'mergeable_state, files_changed, author_login, author_avatar, repo_owner_avatar, '
+    'checks_passed, checks_failed, checks_skipped, commits_count, behind_by, '
+    'review_status, last_updated_at, last_refreshed_at, is_draft, '
+    'open_conversations_count, reviewers_json, overall_score, ci_score, review_score, '
+    'classification, merge_ready, blockers, warnings, recommendations, '
+    'review_health_classification, review_health_score, response_rate, total_feedback, '
+    'responded_feedback, stale_feedback_count, stale_feedback, readiness_computed_at'
+)
+
+# Statements shared by several handlers; run through prepared() so each is
+# compiled once per D1 binding rather than on every request
+_SELECT_PR_BY_ID_SQL = 'SELECT * FROM prs WHERE id = ?'
+# Only the columns the timeline/review-analysis responses use; SELECT * would
+# also convert the readiness JSON blobs through to_py()
+_SELECT_PR_SUMMARY_BY_ID_SQL = 'SELECT id, title, author_login, repo_owner, repo_name, pr_number FROM prs WHERE id = ?'
+_SELECT_PR_BY_URL_SQL = 'SELECT * FROM prs WHERE pr_url = ?'
+_SELECT_PR_ID_BY_URL_SQL = 'SELECT id FROM prs WHERE pr_url = ?'
+_DELETE_PR_BY_ID_SQL = 'DELETE FROM prs WHERE id = ?'
+
+# GitHub webhook events handle_github_webhook acts on; others are acknowledged unread
+_HANDLED_WEBHOOK_EVENTS = frozenset({'pull_request', 'pull_request_review', 'check_run', 'check_suite'})
+
+# GitHub organization/user login: alphanumeric or hyphen, max 39 chars, no leading hyphen
+_ORG_NAME_RE = re.compile(r'[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})\Z')
+
+# Longest PR ID accepted from a path: 18 digits always fits a signed 64-bit integer
+_MAX_PR_ID_DIGITS = 18
+
+# PR ID in per-PR sub-resource paths: /api/prs/{id}/timeline etc. ASCII digits
+# only and at most _MAX_PR_ID_DIGITS of them, so int() can neither raise nor
+# overflow a D1 integer
+_PR_ID_RE = re.compile(rf'^/api/prs/([0-9]{{1,{_MAX_PR_ID_DIGITS}}})/')
+
+def _response_init(status, headers):
+    """Convert a Response init (status + headers) to a JS object once"""
+    return to_js({'status': status, 'headers': headers}, dict_converter=Object.fromEntries)
+
+
+# Response init objects for GET /api/prs/{id}/readiness, converted to JS once
+# per isolate; Response.new copies them, so sharing across responses is safe
+_READINESS_HIT_INIT = _response_init(200, {
+    'Content-Type': 'application/json',
+    'X-Cache': 'HIT',
+    'Cache-Control': f'private, max-age={_READINESS_CACHE_TTL}',
+    'Vary': 'Accept-Encoding'
+})
+_READINESS_MISS_INIT = _response_init(200, {
+    'Content-Type': 'application/json',
+    'X-Cache': 'MISS',
+    'Cache-Control': f'private, max-age={_READINESS_CACHE_TTL}',
+    'Vary': 'Accept-Encoding'
+})
+
+# Plain JSON response inits shared by the handlers below
+_JSON_200_INIT = _response_init(200, {'Content-Type': 'application/json'})
+_JSON_400_INIT = _response_init(400, {'Content-Type': 'application/json'})
+_JSON_401_INIT = _response_init(401, {'Content-Type': 'application/json'})
+_JSON_403_INIT = _response_init(403, {'Content-Type': 'application/json'})
+_JSON_404_INIT = _response_init(404, {'Content-Type': 'application/json'})
+_JSON_500_INIT = _response_init(500, {'Content-Type': 'application/json'})
+
+# GET /api/status: row counts change slowly, so let browsers and shared caches
+# reuse a success for a minute; a failure is transient and must not be cached
+_STATUS_OK_INIT = _response_init(200, {
+    'Content-Type': 'application/json',
+    'Cache-Control': 'public, max-age=60, stale-while-revalidate=300'
+})
+_STATUS_ERROR_INIT = _response_init(200, {
+    'Content-Type': 'application/json',
+    'Cache-Control': 'no-store'
+})
+
+# Fixed error bodies returned from several handlers, serialized once
+_PR_NOT_FOUND_BODY = json.dumps({'error': 'PR not found'})
+_INVALID_PR_ID_BODY = json.dumps({'error': 'Invalid PR ID in path'})
+_GITHUB_FETCH_FAILED_BODY = json.dumps({'error': 'Failed to fetch PR data from GitHub'})
+
+
+# Quick refreshes of a PR refreshed less than this many seconds ago are answered
+# from the stored row; the window stretches up to 2x as the GitHub budget drains
+_QUICK_REFRESH_REUSE_SECONDS = 30
+
+
+def _recently_refreshed(row):
+    """Return True if the PR row was refreshed inside the rate-limit scaled reuse window"""
+    refreshed_at = row.get('last_refreshed_at')
+    if not refreshed_at:
+        return False
+    try:
+        refreshed = datetime.fromisoformat(refreshed_at.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    if refreshed.tzinfo is None:
+        refreshed = refreshed.replace(tzinfo=timezone.utc)
+    
+    rate_limit = get_rate_limit_cache()
+    limit = rate_limit.get('limit') or 0
+    pressure = 1 - min(rate_limit.get('remaining') or 0, limit) / limit if limit else 0
+    age = (datetime.now(timezone.utc) - refreshed).total_seconds()
+    return 0 <= age < _QUICK_REFRESH_REUSE_SECONDS * (1 + pressure)
+
+
 # Maximum PRs to import/discover per bulk operation to prevent timeouts on large orgs
 _MAX_PRS_PER_BULK_OP = 1000
 
+# Base headers for bulk /pulls listing. Kept as a plain dict so github_api can
+# reuse its converted static headers for every page; only the token is added per call.
+_GITHUB_LIST_HEADERS = {
+    'User-Agent': 'PR-Tracker/1.0',
+    'Accept': 'application/vnd.github+json',
+    'X-GitHub-Api-Version': '2022-11-28'
+}
+
+
+def _bulk_import_stmt(db, item, owner, repo, ts):
+    """Build the upsert statement for one PR from a /pulls listing item"""
+    # Safely access user fields - user can be null for deleted accounts
+    user = item.get('user') or {}
+    return build_listing_upsert_stmt(
+        db, item['html_url'], owner, repo, item['number'],
+        item.get('title') or '',
+        user.get('login', 'ghost') or '',
+        user.get('avatar_url') or '',
+        item.get('base', {}).get('repo', {}).get('owner', {}).get('avatar_url') or '',
+        item.get('updated_at') or ts,
+        1 if item.get('draft') else 0,
+        ts
+    )
+
+
+def _json_default(obj):
+    """json.dumps fallback that writes datetimes as ISO 8601 strings"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+async def _internal_error_response(env, e, handler):
+    """Report an unhandled handler exception to Slack and build the 500 JSON response"""
+    await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': handler})
+    return Response.new(
+        json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
+        _JSON_500_INIT
+    )
+
 
 def _is_caller_scoped_token(token_info):
     """Return True when the request uses a caller-provided token."""
@@ -47,10 +199,24 @@ def _private_repo_rejected_response():
         json.dumps({
             'error': 'Private repository data cannot be stored with caller-scoped credentials in this shared deployment. Use a shared GitHub token or import only public repositories.'
         }),
-        {'status': 403, 'headers': {'Content-Type': 'application/json'}}
+        _JSON_403_INIT
     )
 
 
+def _etag_matches(etag, if_none_match):
+    """Weak comparison of etag against each entity tag in an If-None-Match header"""
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
 async def handle_add_pr(request, env):
     """
     Handle adding a new PR or importing all PRs from a repo.
@@ -67,7 +233,7 @@ async def handle_add_pr(request, env):
         except Exception:
             return Response.new(
                 json.dumps({'error': 'Malformed JSON payload'}),
-                {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_400_INIT
             )
         
         pr_url = data.get('pr_url')
@@ -80,7 +246,7 @@ async def handle_add_pr(request, env):
         if not pr_url or not isinstance(pr_url, str):
             return Response.new(
                 json.dumps({'error': 'A valid GitHub PR URL is required'}),
-                {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_400_INIT
             )
         
         db = get_db(env)
@@ -105,7 +271,7 @@ async def handle_add_pr(request, env):
                 org_parsed = parse_org_url(pr_url)
                 if not org_parsed:
                     return Response.new(json.dumps({'error': 'Invalid GitHub Repository or Organization URL'}), 
-                                      {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                                      _JSON_400_INIT)
                 
                 org_owner = org_parsed['owner']
                 is_org_import = True
@@ -117,26 +283,20 @@ async def handle_add_pr(request, env):
                     error_msg = str(e)
                     if 'status=403' in error_msg:
                         return Response.new(json.dumps({'error': 'Rate Limit Exceeded'}), 
-                                          {'status': 403, 'headers': {'Content-Type': 'application/json'}})
+                                          _JSON_403_INIT)
                     return Response.new(json.dumps({'error': f'Failed to fetch organization repos: {error_msg}'}), 
-                                      {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                                      _JSON_400_INIT)
                 
                 if not org_repos:
                     return Response.new(json.dumps({'error': f'No public repositories found for {org_owner}'}), 
-                                      {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+                                      _JSON_404_INIT)
                 
                 repos_to_import = [{'owner': r['owner'], 'name': r['name']} for r in org_repos]
             
             # Prepare headers for paginated fetching
-            headers_dict = {
-                'User-Agent': 'PR-Tracker/1.0',
-                'Accept': 'application/vnd.github+json',
-                'X-GitHub-Api-Version': '2022-11-28'
-            }
+            headers = dict(_GITHUB_LIST_HEADERS)
             if user_token:
-                headers_dict['Authorization'] = f'Bearer {user_token}'
-            
-            headers = Headers.new(to_js(headers_dict, dict_converter=Object.fromEntries))
+                headers['Authorization'] = f'Bearer {user_token}'
             
             # Fetch open PRs with a safety limit to prevent timeouts on very large repos
             # Maximum 1000 PRs per import to stay within Cloudflare Workers execution limits
@@ -144,7 +304,8 @@ async def handle_add_pr(request, env):
             added_count = 0
             truncated = False
             repos_imported = 0
-            ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            pending_write = None
+            ts = utc_now_iso()
             
             for repo_info in repos_to_import:
                 owner = repo_info['owner']
@@ -183,36 +344,21 @@ async def handle_add_pr(request, env):
                     )
                     if private_repo_seen:
                         print(f"Security: Rejected caller-scoped bulk import for private repo {owner}/{repo}")
+                        if pending_write is not None:
+                            await pending_write
                         return _private_repo_rejected_response()
                 
                 repos_imported += 1
                 
-                for item in prs_list:
-                    # Safely access user fields - user can be null for deleted accounts
-                    user = item.get('user') or {}
-                    
-                    pr_data = {
-                        'title': item.get('title', ''), 
-                        'state': 'open', 
-                        'is_merged': 0,
-                        'mergeable_state': 'unknown', 
-                        'files_changed': 0,
-                        'author_login': user.get('login', 'ghost'), 
-                        'author_avatar': user.get('avatar_url', ''),
-                        'repo_owner_avatar': item.get('base', {}).get('repo', {}).get('owner', {}).get('avatar_url', ''),
-                        'checks_passed': 0, 
-                        'checks_failed': 0, 
-                        'checks_skipped': 0,
-                        'review_status': 'pending', 
-                        'last_updated_at': item.get('updated_at', ts),
-                        'commits_count': 0,
-                        'behind_by': 0,
-                        'is_draft': 1 if item.get('draft') else 0,
-                        'reviewers_json': '[]'
-                    }
-
-                    await upsert_pr(db, item['html_url'], owner, repo, item['number'], pr_data)
-                    added_count += 1
+                # Write this repo's PRs in one D1 round-trip while the next repo is fetched
+                upsert_stmts = [_bulk_import_stmt(db, item, owner, repo, ts) for item in prs_list]
+                if pending_write is not None:
+                    await pending_write
+                pending_write = asyncio.ensure_future(run_batch(db, upsert_stmts))
+                added_count += len(upsert_stmts)
+            
+            if pending_write is not None:
+                await pending_write
             
             # Build response message
             if is_org_import:
@@ -230,7 +376,7 @@ async def handle_add_pr(request, env):
             }
             
             return Response.new(json.dumps(response_data), 
-                              {'headers': {'Content-Type': 'application/json'}})
+                              _JSON_200_INIT)
 
         else:
             # Add single pr
@@ -240,7 +386,7 @@ async def handle_add_pr(request, env):
             except ValueError as e:
                 return Response.new(
                     json.dumps({'error': str(e)}),
-                    {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                    _JSON_400_INIT
                 )
             
             # Fetch PR data 
@@ -249,7 +395,7 @@ async def handle_add_pr(request, env):
             if not pr_data:
                 # If null returned
                 return Response.new(json.dumps({'error': 'Failed to fetch PR data (Rate Limit or Not Found)'}), 
-                                  {'status': 403, 'headers': {'Content-Type': 'application/json'}})
+                                  _JSON_403_INIT)
 
             if caller_scoped_token and pr_data.get('repo_private'):
                 print(f"Security: Rejected caller-scoped import for private PR URL: {pr_url}")
@@ -257,18 +403,20 @@ async def handle_add_pr(request, env):
             
             if pr_data['is_merged'] or pr_data['state'] == 'closed':
                 return Response.new(json.dumps({'error': 'Cannot add merged/closed PRs'}), 
-                                  {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                                  _JSON_400_INIT)
             
-            await upsert_pr(db, pr_url, parsed['owner'], parsed['repo'], parsed['pr_number'], pr_data)
+            # Upsert and read back the stored row in a single D1 round-trip
+            batch_results = await run_batch(db, [
+                build_upsert_stmt(db, pr_url, parsed['owner'], parsed['repo'], parsed['pr_number'], pr_data),
+                prepared(db, _SELECT_PR_BY_URL_SQL).bind(pr_url)
+            ])
             
             # Auto-run readiness analysis for the newly added PR
             readiness_data = None
             try:
-                pr_result = await db.prepare(
-                    'SELECT * FROM prs WHERE pr_url = ?'
-                ).bind(pr_url).first()
-                if pr_result:
-                    pr_row = pr_result.to_py()
+                pr_rows = batch_results[-1].results
+                if pr_rows.length:
+                    pr_row = pr_rows[0].to_py()
                     readiness_data = await _run_readiness_analysis(env, pr_row, pr_row['id'], user_token)
             except Exception as analysis_err:
                 print(f"Auto-analysis failed for PR {pr_url}: {type(analysis_err).__name__}: {str(analysis_err)}")
@@ -287,7 +435,7 @@ async def handle_add_pr(request, env):
                 result_obj['readiness'] = readiness_data
             
             return Response.new(json.dumps(result_obj), 
-                              {'headers': {'Content-Type': 'application/json'}})
+                              _JSON_200_INIT)
 
     except Exception as e:
         # Generic error message to prevent information disclosure
@@ -295,11 +443,14 @@ async def handle_add_pr(request, env):
         await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_add_pr'})
         return Response.new(
             json.dumps({'error': 'Internal server error'}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
+            _JSON_500_INIT
         )
 
-async def handle_list_prs(env, repo_filter=None, page=1, per_page=30, sort_by=None, sort_dir=None, org_filter=None, author_filter=None):
-    """List PRs with pagination and sorting (default 30 per page)."""
+async def handle_list_prs(env, repo_filter=None, page=1, per_page=30, sort_by=None, sort_dir=None, org_filter=None, author_filter=None, if_none_match=None):
+    """List PRs with pagination and sorting (default 30 per page).
+
+    Answers 304 when if_none_match still matches the filtered set's ETag.
+    """
     try:
         db = get_db(env)
         try:
@@ -412,53 +563,68 @@ async def handle_list_prs(env, repo_filter=None, page=1, per_page=30, sort_by=No
         # Note: All columns are validated via is_valid_column_name(), so no SQL injection risk
         order_clause = 'ORDER BY ' + ', '.join(sort_clauses)
 
-        # Total count first
-        count_stmt = db.prepare(f'''
-            SELECT COUNT(*) as total
+        # Total count first, read together with the prs change counter (bumped by
+        # triggers on every insert/update/delete) that validates the ETag.
+        # updated_at only has one-second resolution, so it can't tell a write in
+        # the same second as the client's copy apart.
+        # The count SQL only varies with which filters are present (a handful of
+        # shapes), so it goes through the prepared-statement cache; the page query
+        # varies with the sort columns and is prepared per request.
+        count_stmt = prepared(db, f'''
+            SELECT COUNT(*) as total,
+                   (SELECT version FROM prs_version WHERE id = 1) as version
             {base_query}
         ''').bind(*params)
 
         count_result = await count_stmt.first()
-        total = count_result.to_py()['total'] if count_result else 0
+        count_row = count_result.to_py() if count_result else {}
+        total = count_row.get('total') or 0
+        etag = f'W/"{total}-{count_row.get("version") or 0}"'
+        # Workers compresses JSON bodies per Accept-Encoding, so caches must key on it
+        cache_headers = {
+            'ETag': etag,
+            'Cache-Control': 'public, max-age=60, stale-while-revalidate=300',
+            'Vary': 'Accept-Encoding'
+        }
+
+        # Unchanged since the client's copy: skip the page query and serialization
+        if if_none_match and _etag_matches(etag, if_none_match):
+            return Response.new(None, {'status': 304, 'headers': cache_headers})
 
         # Fetch paginated data with sorting
         data_stmt = db.prepare(f'''
-            SELECT *
+            SELECT {_PR_LIST_COLUMNS}
             {base_query}
             {order_clause}
             LIMIT ? OFFSET ?
         ''').bind(*params, per_page, offset)
 
         result = await data_stmt.all()
-        prs = result.results.to_py() if hasattr(result, 'results') else []
-
-        return Response.new(json.dumps({
-            'prs': prs,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total_items': total,
-                'total_pages': (total + per_page - 1) // per_page,
-                'has_next': page * per_page < total,
-                'has_previous': page > 1
-            }
-        }), {'headers': {
-            'Content-Type': 'application/json',
-            'Cache-Control': 'public, max-age=60, stale-while-revalidate=300'
-        }})
+        # D1 rows are plain JS objects: serialize them on the JS side rather than
+        # converting every row to a Python dict only to json.dumps it again
+        prs_json = JSON.stringify(result.results) if hasattr(result, 'results') else '[]'
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'total_items': total,
+            'total_pages': (total + per_page - 1) // per_page,
+            'has_next': page * per_page < total,
+            'has_previous': page > 1
+        }
 
-    except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_list_prs'})
         return Response.new(
-            json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
+            f'{{"prs": {prs_json}, "pagination": {json.dumps(pagination)}}}',
+            {'headers': {'Content-Type': 'application/json', **cache_headers}}
         )
 
+    except Exception as e:
+        return await _internal_error_response(env, e, 'handle_list_prs')
+
 async def handle_list_repos(env):
     """List all unique repos with count of open PRs"""
     try:
         db = get_db(env)
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             SELECT DISTINCT repo_owner, repo_name, 
                    COUNT(*) as pr_count,
                    SUM(CASE WHEN readiness_computed_at IS NOT NULL THEN 1 ELSE 0 END) as analyzed_count,
@@ -470,24 +636,22 @@ async def handle_list_repos(env):
         ''')
         
         result = await stmt.all()
-        # Convert JS Array to Python list
-        repos = result.results.to_py() if hasattr(result, 'results') else []
+        # Serialize the JS rows on the JS side instead of converting to Python first
+        repos_json = JSON.stringify(result.results) if hasattr(result, 'results') else '[]'
         
-        return Response.new(json.dumps({'repos': repos}), 
+        return Response.new(f'{{"repos": {repos_json}}}', 
                           {'headers': {
                               'Content-Type': 'application/json',
                               'Cache-Control': 'public, max-age=60, stale-while-revalidate=300'
                           }})
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_list_repos'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}), 
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_list_repos')
 
 async def handle_list_authors(env):
     """List all unique PR authors (including bots) with count of open PRs"""
     try:
         db = get_db(env)
-        stmt = db.prepare('''
+        stmt = prepared(db, '''
             SELECT author_login, COUNT(*) as pr_count,
                    MAX(author_avatar) as author_avatar
             FROM prs
@@ -497,17 +661,41 @@ async def handle_list_authors(env):
         ''')
 
         result = await stmt.all()
-        authors = result.results.to_py() if hasattr(result, 'results') else []
+        # Serialize the JS rows on the JS side instead of converting to Python first
+        authors_json = JSON.stringify(result.results) if hasattr(result, 'results') else '[]'
 
-        return Response.new(json.dumps({'authors': authors}),
+        return Response.new(f'{{"authors": {authors_json}}}',
                           {'headers': {
                               'Content-Type': 'application/json',
                               'Cache-Control': 'public, max-age=60, stale-while-revalidate=300'
                           }})
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_list_authors'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_list_authors')
+
+
+async def _remove_tracked_pr(db, pr_id, owner, repo, pr_number):
+    """Delete a PR and its stored timeline in one D1 batch, evicting memory caches.
+    
+    Readiness results live in the prs row itself, so deleting the row clears them.
+    """
+    evict_readiness_cache(pr_id)
+    evict_timeline_cache(owner, repo, pr_number)
+    await run_batch(db, [
+        build_delete_timeline_stmt(db, owner, repo, pr_number),
+        prepared(db, _DELETE_PR_BY_ID_SQL).bind(pr_id)
+    ])
+
+
+def _update_tracked_pr_stmts(db, pr_id, pr_url, owner, repo, pr_number, pr_data, current_timestamp=None):
+    """Evict a PR's memory caches and return the D1 statements that store fresh
+    data and clear its readiness and timeline rows, for the caller to batch."""
+    evict_readiness_cache(pr_id)
+    evict_timeline_cache(owner, repo, pr_number)
+    return [
+        build_upsert_stmt(db, pr_url, owner, repo, pr_number, pr_data, current_timestamp),
+        build_clear_readiness_stmt(db, pr_id),
+        build_delete_timeline_stmt(db, owner, repo, pr_number)
+    ]
 
 
 async def handle_refresh_pr(request, env):
@@ -527,19 +715,29 @@ async def handle_refresh_pr(request, env):
         
         if not pr_id:
             return Response.new(json.dumps({'error': 'PR ID is required'}), 
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_400_INIT)
         
-        # Get PR URL and ETag from database
+        # Get the stored row (URL, ETag, and the values a no-op refresh compares against)
         db = get_db(env)
-        stmt = db.prepare('SELECT pr_url, repo_owner, repo_name, pr_number, etag FROM prs WHERE id = ?').bind(pr_id)
+        stmt = prepared(db, _SELECT_PR_BY_ID_SQL).bind(pr_id)
         result = await stmt.first()
         
         if not result:
-            return Response.new(json.dumps({'error': 'PR not found'}), 
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+            return Response.new(_PR_NOT_FOUND_BODY, 
+                              _JSON_404_INIT)
         
         # Convert JsProxy to Python dict to make it subscriptable
         result = result.to_py()
+        
+        # A quick refresh right after another refresh (double clicks, several viewers)
+        # would only re-ask GitHub for what was just stored
+        if quick_refresh and _recently_refreshed(result):
+            return Response.new(json.dumps({
+                'success': True,
+                'data': result,
+                'fast_path': True,
+                'rate_limit': get_rate_limit_cache()
+            }), _JSON_200_INIT)
             
         # Fetch fresh data from GitHub (with Token and ETag)
         pr_data = await fetch_pr_data(
@@ -550,72 +748,72 @@ async def handle_refresh_pr(request, env):
             result.get('etag')
         )
         
-        # Fast-Path: If data is unchanged (304 Not Modified), skip analysis and database update
+        # Fast-Path: If data is unchanged (304 Not Modified), skip analysis and only
+        # record the refresh time, re-reading the row in the same D1 batch
         if pr_data and pr_data.get('not_modified'):
             print(f"Fast-path: PR #{result['pr_number']} data unchanged, skipping analysis")
             
-            # Fetch existing PR data from DB to return to frontend
-            # We already have some of it in 'result', but let's get the full row for completeness
-            full_stmt = db.prepare('SELECT * FROM prs WHERE id = ?').bind(pr_id)
-            full_result = await full_stmt.first()
-            response_data = full_result.to_py() if hasattr(full_result, 'to_py') else dict(full_result)
-            
+            batch_results = await run_batch(db, [
+                build_touch_refreshed_stmt(db, pr_id),
+                prepared(db, _SELECT_PR_BY_ID_SQL).bind(pr_id)
+            ])
+            touched_rows = batch_results[-1].results
             return Response.new(json.dumps({
                 'success': True,
-                'data': response_data,
+                'data': touched_rows[0].to_py() if touched_rows.length else result,
                 'fast_path': True,
                 'rate_limit': get_rate_limit_cache()
-            }), {'headers': {'Content-Type': 'application/json'}})
+            }), _JSON_200_INIT)
         
         if pr_data and pr_data.get('not_found'):
             if quick_refresh:
-                await invalidate_readiness_cache(env, pr_id)
-                await invalidate_timeline_cache(env, result['repo_owner'], result['repo_name'], result['pr_number'])
-                delete_stmt = db.prepare('DELETE FROM prs WHERE id = ?').bind(pr_id)
-                await delete_stmt.run()
+                await _remove_tracked_pr(db, pr_id, result['repo_owner'], result['repo_name'], result['pr_number'])
                 return Response.new(json.dumps({
                     'success': True,
                     'removed': True,
                     'message': 'PR not found on GitHub and removed from tracking'
-                }), {'headers': {'Content-Type': 'application/json'}})
+                }), _JSON_200_INIT)
             return Response.new(json.dumps({'error': 'PR not found on GitHub'}),
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_404_INIT)
 
         if not pr_data:
-            return Response.new(json.dumps({'error': 'Failed to fetch PR data from GitHub'}), 
-                              {'status': 403, 'headers': {'Content-Type': 'application/json'}})
+            return Response.new(_GITHUB_FETCH_FAILED_BODY, 
+                              _JSON_403_INIT)
         
         # Check if PR is now merged or closed - delete it from database
         if pr_data['is_merged'] or pr_data['state'] == 'closed':
-            # Invalidate caches since PR state changed
-            await invalidate_readiness_cache(env, pr_id)
-            await invalidate_timeline_cache(env, result['repo_owner'], result['repo_name'], result['pr_number'])
-            
-            # Delete the PR from database
-            delete_stmt = db.prepare('DELETE FROM prs WHERE id = ?').bind(pr_id)
-            await delete_stmt.run()
+            # Delete the PR and its cached timeline from database
+            await _remove_tracked_pr(db, pr_id, result['repo_owner'], result['repo_name'], result['pr_number'])
             
             status_msg = 'merged' if pr_data['is_merged'] else 'closed'
             return Response.new(json.dumps({
                 'success': True, 
                 'removed': True,
                 'message': f'PR has been {status_msg} and removed from tracking'
-            }), {'headers': {'Content-Type': 'application/json'}})
+            }), _JSON_200_INIT)
         
-        await upsert_pr(db, result['pr_url'], result['repo_owner'], result['repo_name'], result['pr_number'], pr_data)
+        # Upsert, cache invalidation and re-read go to D1 as one batch (one round-trip).
+        # When GitHub returned what is already stored, only the refresh time is written.
+        if pr_row_unchanged(result, pr_data):
+            stmts = [build_touch_refreshed_stmt(db, pr_id)]
+        else:
+            stmts = [build_upsert_stmt(db, result['pr_url'], result['repo_owner'], result['repo_name'], result['pr_number'], pr_data)]
         
         # For a full Analyze refresh, invalidate readiness so stale scores are cleared.
         # For a quick refresh, preserve existing readiness data so the UI stays intact.
         if not quick_refresh:
-            await invalidate_readiness_cache(env, pr_id)
-        await invalidate_timeline_cache(env, result['repo_owner'], result['repo_name'], result['pr_number'])
+            evict_readiness_cache(pr_id)
+            stmts.append(build_clear_readiness_stmt(db, pr_id))
+        evict_timeline_cache(result['repo_owner'], result['repo_name'], result['pr_number'])
+        stmts.append(build_delete_timeline_stmt(db, result['repo_owner'], result['repo_name'], result['pr_number']))
         
         # Fetch the full updated DB row so the frontend receives all fields
         # (including updated_at, created_at, readiness_computed_at, etc.)
-        full_stmt = db.prepare('SELECT * FROM prs WHERE id = ?').bind(pr_id)
-        full_result = await full_stmt.first()
-        if full_result:
-            response_data = full_result.to_py() if hasattr(full_result, 'to_py') else dict(full_result)
+        stmts.append(prepared(db, _SELECT_PR_BY_ID_SQL).bind(pr_id))
+        batch_results = await run_batch(db, stmts)
+        full_rows = batch_results[-1].results
+        if full_rows.length:
+            response_data = full_rows[0].to_py()
         else:
             # Fallback: the row was just upserted so this shouldn't happen, but be safe
             response_data = {
@@ -630,12 +828,10 @@ async def handle_refresh_pr(request, env):
             'success': True,
             'data': response_data,
             'rate_limit': get_rate_limit_cache()
-        }), {'headers': {'Content-Type': 'application/json'}})
+        }), _JSON_200_INIT)
         
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_refresh_pr'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_refresh_pr')
 
 async def handle_batch_refresh_prs(request, env):
     """
@@ -654,11 +850,11 @@ async def handle_batch_refresh_prs(request, env):
         
         if not pr_ids or not isinstance(pr_ids, list):
             return Response.new(json.dumps({'error': 'pr_ids array is required'}), 
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_400_INIT)
         
         if len(pr_ids) > 100:
             return Response.new(json.dumps({'error': 'Maximum 100 PRs can be refreshed at once'}), 
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_400_INIT)
         
         # Get PR details from database in a single query instead of N separate queries
         db = get_db(env)
@@ -687,16 +883,19 @@ async def handle_batch_refresh_prs(request, env):
         
         if not prs_to_fetch:
             return Response.new(json.dumps({'error': 'No valid PRs found'}), 
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_404_INIT)
         
         # Batch fetch PR data from GitHub
         print(f"Batch refreshing {len(prs_to_fetch)} PRs")
         batch_results = await fetch_multiple_prs_batch(prs_to_fetch, user_token)
         
-        # Update database and collect results
+        # Collect every PR's writes as (result list, entry, D1 statements) so they
+        # can be committed together instead of several awaited writes per PR
         updated_prs = []
         removed_prs = []
         errors = []
+        writes = []
+        ts = utc_now_iso()
         
         for (owner, repo, pr_number), pr_data in batch_results.items():
             pr_id, pr_url, etag = pr_lookup[(owner, repo, pr_number)]
@@ -708,25 +907,35 @@ async def handle_batch_refresh_prs(request, env):
             # Check if PR is now merged or closed - remove it
             # Note: GraphQL returns state in lowercase (e.g., 'closed', 'open')
             if pr_data['is_merged'] or pr_data['state'] == 'closed':
-                await invalidate_readiness_cache(env, pr_id)
-                await invalidate_timeline_cache(env, owner, repo, pr_number)
-                
-                delete_stmt = db.prepare('DELETE FROM prs WHERE id = ?').bind(pr_id)
-                await delete_stmt.run()
-                
+                # Readiness results live in the prs row itself, so deleting the row clears them
+                evict_readiness_cache(pr_id)
+                evict_timeline_cache(owner, repo, pr_number)
                 status_msg = 'merged' if pr_data['is_merged'] else 'closed'
-                removed_prs.append({'pr_id': pr_id, 'pr_number': pr_number, 'status': status_msg})
+                writes.append((removed_prs, {'pr_id': pr_id, 'pr_number': pr_number, 'status': status_msg}, [
+                    build_delete_timeline_stmt(db, owner, repo, pr_number),
+                    prepared(db, _DELETE_PR_BY_ID_SQL).bind(pr_id)
+                ]))
                 continue
             
             # Update PR data
-            try:
-                await upsert_pr(db, pr_url, owner, repo, pr_number, pr_data)
-                await invalidate_readiness_cache(env, pr_id)
-                await invalidate_timeline_cache(env, owner, repo, pr_number)
-                updated_prs.append({'pr_id': pr_id, 'pr_number': pr_number})
-            except Exception as update_error:
-                print(f"Error updating PR #{pr_number} in {owner}/{repo}: {str(update_error)}")
-                errors.append({'pr_id': pr_id, 'pr_number': pr_number, 'error': str(update_error)})
+            writes.append((updated_prs, {'pr_id': pr_id, 'pr_number': pr_number},
+                           _update_tracked_pr_stmts(db, pr_id, pr_url, owner, repo, pr_number, pr_data, ts)))
+        
+        # One D1 round-trip per 100 statements. Each batch is a transaction, so if it
+        # fails, retry PR by PR (the writes are idempotent) to fail only the bad row.
+        try:
+            await run_batch(db, [stmt for _, _, stmts in writes for stmt in stmts])
+            for results, entry, _ in writes:
+                results.append(entry)
+        except Exception as batch_error:
+            print(f"Batch refresh write failed, retrying per PR: {str(batch_error)}")
+            for results, entry, stmts in writes:
+                try:
+                    await run_batch(db, stmts)
+                    results.append(entry)
+                except Exception as update_error:
+                    print(f"Error updating PR #{entry['pr_number']}: {str(update_error)}")
+                    errors.append({'pr_id': entry['pr_id'], 'pr_number': entry['pr_number'], 'error': str(update_error)})
         
         return Response.new(json.dumps({
             'success': True,
@@ -737,12 +946,10 @@ async def handle_batch_refresh_prs(request, env):
             'removed_prs': removed_prs,
             'error_prs': errors,
             'rate_limit': get_rate_limit_cache()
-        }), {'headers': {'Content-Type': 'application/json'}})
+        }), _JSON_200_INIT)
         
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_batch_refresh_prs'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_batch_refresh_prs')
 
 
 async def handle_refresh_org(request, env):
@@ -756,37 +963,33 @@ async def handle_refresh_org(request, env):
         if not org:
             return Response.new(
                 json.dumps({'error': 'Organization is required'}),
-                {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_400_INIT
             )
 
-        if not re.match(r'^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$', org):
+        if not _ORG_NAME_RE.match(org):
             return Response.new(
                 json.dumps({'error': 'Invalid organization name'}),
-                {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_400_INIT
             )
 
         repos_to_import = await fetch_org_repos(org, token=user_token)
         if not repos_to_import:
             return Response.new(
                 json.dumps({'success': True, 'imported_count': 0, 'repos_scanned': 0, 'truncated': False}),
-                {'headers': {'Content-Type': 'application/json'}}
+                _JSON_200_INIT
             )
 
         db = get_db(env)
-        headers_dict = {
-            'User-Agent': 'PR-Tracker/1.0',
-            'Accept': 'application/vnd.github+json',
-            'X-GitHub-Api-Version': '2022-11-28'
-        }
+        headers = dict(_GITHUB_LIST_HEADERS)
         if user_token:
-            headers_dict['Authorization'] = f'Bearer {user_token}'
-        headers = Headers.new(to_js(headers_dict, dict_converter=Object.fromEntries))
+            headers['Authorization'] = f'Bearer {user_token}'
 
         MAX_PRS_PER_IMPORT = _MAX_PRS_PER_BULK_OP
         added_count = 0
         truncated = False
         repos_scanned = 0
-        ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        pending_write = None
+        ts = utc_now_iso()
 
         for repo_info in repos_to_import:
             owner = repo_info['owner']
@@ -815,29 +1018,15 @@ async def handle_refresh_org(request, env):
             if not prs_list:
                 continue
 
-            for item in prs_list:
-                user = item.get('user') or {}
-                pr_data = {
-                    'title': item.get('title', ''),
-                    'state': 'open',
-                    'is_merged': 0,
-                    'mergeable_state': 'unknown',
-                    'files_changed': 0,
-                    'author_login': user.get('login', 'ghost'),
-                    'author_avatar': user.get('avatar_url', ''),
-                    'repo_owner_avatar': item.get('base', {}).get('repo', {}).get('owner', {}).get('avatar_url', ''),
-                    'checks_passed': 0,
-                    'checks_failed': 0,
-                    'checks_skipped': 0,
-                    'review_status': 'pending',
-                    'last_updated_at': item.get('updated_at', ts),
-                    'commits_count': 0,
-                    'behind_by': 0,
-                    'is_draft': 1 if item.get('draft') else 0,
-                    'reviewers_json': '[]'
-                }
-                await upsert_pr(db, item['html_url'], owner, repo, item['number'], pr_data)
-                added_count += 1
+            # Write this repo's PRs in one D1 round-trip while the next repo is fetched
+            upsert_stmts = [_bulk_import_stmt(db, item, owner, repo, ts) for item in prs_list]
+            if pending_write is not None:
+                await pending_write
+            pending_write = asyncio.ensure_future(run_batch(db, upsert_stmts))
+            added_count += len(upsert_stmts)
+
+        if pending_write is not None:
+            await pending_write
 
         return Response.new(
             json.dumps({
@@ -846,14 +1035,10 @@ async def handle_refresh_org(request, env):
                 'repos_scanned': repos_scanned,
                 'truncated': truncated
             }),
-            {'headers': {'Content-Type': 'application/json'}}
+            _JSON_200_INIT
         )
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_refresh_org'})
-        return Response.new(
-            json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
-        )
+        return await _internal_error_response(env, e, 'handle_refresh_org')
         
 async def handle_rate_limit(request, env):
     """
@@ -925,22 +1110,25 @@ async def handle_rate_limit(request, env):
         await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_rate_limit'})
         return Response.new(
             json.dumps({'error': 'Internal server error fetching rate status'}), 
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
+            _JSON_500_INIT
         )
 
 async def handle_status(env):
     """Check database status and return row counts"""
     try:
         db = get_db(env)
-        # Query row counts for each table
-        prs_result = await db.prepare('SELECT COUNT(*) as count FROM prs').first()
-        timeline_result = await db.prepare('SELECT COUNT(*) as count FROM timeline_cache').first()
+        # Query row counts for each table in a single D1 round-trip
+        prs_result, timeline_result = await run_batch(db, [
+            prepared(db, 'SELECT COUNT(*) as count FROM prs'),
+            prepared(db, 'SELECT COUNT(*) as count FROM timeline_cache')
+        ])
 
-        def _row_to_dict(r):
-            return r.to_py() if hasattr(r, 'to_py') else dict(r)
+        def _count(result):
+            rows = result.results
+            return rows[0].to_py().get('count', 0) if rows.length else 0
 
-        prs_count = _row_to_dict(prs_result).get('count', 0) if prs_result else 0
-        timeline_count = _row_to_dict(timeline_result).get('count', 0) if timeline_result else 0
+        prs_count = _count(prs_result)
+        timeline_count = _count(timeline_result)
 
         return Response.new(json.dumps({
             'database_configured': True,
@@ -949,7 +1137,7 @@ async def handle_status(env):
                 'prs': prs_count,
                 'timeline_cache': timeline_count
             }
-        }), {'headers': {'Content-Type': 'application/json'}})
+        }), _STATUS_OK_INIT)
     except Exception as e:
         # Database not configured
         return Response.new(json.dumps({
@@ -960,7 +1148,7 @@ async def handle_status(env):
                 'prs': 0,
                 'timeline_cache': 0
             }
-        }), {'headers': {'Content-Type': 'application/json'}})
+        }), _STATUS_ERROR_INIT)
 
 async def handle_pr_updates_check(env):
     """
@@ -974,34 +1162,21 @@ async def handle_pr_updates_check(env):
         db = get_db(env)
         
         # Fetch only IDs and timestamps - minimal data transfer
-        stmt = db.prepare('SELECT id, updated_at FROM prs ORDER BY id')
+        stmt = prepared(db, 'SELECT id, updated_at FROM prs ORDER BY id')
         result = await stmt.all()
         
         if not result or not result.results:
             return Response.new(
                 json.dumps({'updates': []}),
-                {'headers': {'Content-Type': 'application/json'}}
+                _JSON_200_INIT
             )
         
-        # Convert to lightweight format
-        updates = []
-        for row in result.results:
-            row_dict = row.to_py()
-            updates.append({
-                'id': row_dict.get('id'),
-                'updated_at': row_dict.get('updated_at')
-            })
-        
-        return Response.new(
-            json.dumps({'updates': updates}),
-            {'headers': {'Content-Type': 'application/json'}}
-        )
+        # Rows already have the {id, updated_at} response shape: serialize them on
+        # the JS side instead of converting every row to a Python dict first
+        updates_json = JSON.stringify(result.results)
+        return Response.new(f'{{"updates": {updates_json}}}', _JSON_200_INIT)
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_pr_updates_check'})
-        return Response.new(
-            json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
-        )
+        return await _internal_error_response(env, e, 'handle_pr_updates_check')
 
 async def handle_get_pr(env, pr_id):
     """
@@ -1012,27 +1187,23 @@ async def handle_get_pr(env, pr_id):
     """
     try:
         db = get_db(env)
-        stmt = db.prepare('SELECT * FROM prs WHERE id = ? AND is_merged = 0 AND state = \'open\'').bind(pr_id)
+        stmt = prepared(db, 'SELECT * FROM prs WHERE id = ? AND is_merged = 0 AND state = \'open\'').bind(pr_id)
         result = await stmt.first()
 
         if not result:
             return Response.new(
-                json.dumps({'error': 'PR not found'}),
-                {'status': 404, 'headers': {'Content-Type': 'application/json'}}
+                _PR_NOT_FOUND_BODY,
+                _JSON_404_INIT
             )
 
         pr = result.to_py() if hasattr(result, 'to_py') else dict(result)
 
         return Response.new(
             json.dumps({'pr': pr}),
-            {'headers': {'Content-Type': 'application/json'}}
+            _JSON_200_INIT
         )
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_get_pr'})
-        return Response.new(
-            json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
-        )
+        return await _internal_error_response(env, e, 'handle_get_pr')
 
 
 async def handle_github_webhook(request, env):
@@ -1065,31 +1236,45 @@ async def handle_github_webhook(request, env):
     - Returns updated PR data for frontend
     """
     try:
+        # Get event type from header
+        event_type = request.headers.get('x-github-event')
+        
+        # Acknowledge events we don't handle before reading, verifying or parsing
+        # the body (push payloads can be large). Nothing is read from or written
+        # for these, so skipping signature verification exposes nothing.
+        if event_type not in _HANDLED_WEBHOOK_EVENTS:
+            return Response.new(
+                json.dumps({
+                    'success': True,
+                    'message': f'Received {event_type} event, no handler configured'
+                }),
+                _JSON_200_INIT
+            )
+        
         # Get webhook secret from environment
         webhook_secret = getattr(env, 'GITHUB_WEBHOOK_SECRET', None)
         
-        # Get raw request body for signature verification
-        raw_body = await request.text()
+        # Get raw request body for signature verification. Read it once as
+        # bytes: HMAC needs the exact bytes GitHub signed, and json.loads parses
+        # UTF-8 bytes directly, so no str decode/re-encode round-trip is needed.
+        raw_body = (await request.arrayBuffer()).to_bytes()
         
         # Verify webhook signature
         if not await verify_github_signature(request, raw_body, webhook_secret):
             return Response.new(
                 json.dumps({'error': 'Invalid webhook signature'}),
-                {'status': 401, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_401_INIT
             )
         
         # Parse webhook payload
         try:
             payload = json.loads(raw_body)
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return Response.new(
                 json.dumps({'error': 'Invalid JSON payload'}),
-                {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                _JSON_400_INIT
             )
         
-        # Get event type from header
-        event_type = request.headers.get('x-github-event')
-        
         if event_type == 'pull_request':
             action = payload.get('action')
             pr_data = payload.get('pull_request', {})
@@ -1105,15 +1290,13 @@ async def handle_github_webhook(request, env):
             if not all([pr_number, repo_owner, repo_name]):
                 return Response.new(
                     json.dumps({'error': 'Missing required PR data'}),
-                    {'status': 400, 'headers': {'Content-Type': 'application/json'}}
+                    _JSON_400_INIT
                 )
             
             # Find the PR in our database
             db = get_db(env)
             pr_url = f"https://github.com/{repo_owner}/{repo_name}/pull/{pr_number}"
-            result = await db.prepare(
-                'SELECT id FROM prs WHERE pr_url = ?'
-            ).bind(pr_url).first()
+            result = await prepared(db, _SELECT_PR_ID_BY_URL_SQL).bind(pr_url).first()
             
             # Handle opened PRs - add to tracking automatically
             if action == 'opened':
@@ -1127,20 +1310,20 @@ async def handle_github_webhook(request, env):
                             'pr_number': pr_number,
                             'message': f'PR #{pr_number} is already being tracked'
                         }),
-                        {'headers': {'Content-Type': 'application/json'}}
+                        _JSON_200_INIT
                     )
                 
                 # Fetch fresh PR data and add to tracking
                 webhook_token = getattr(env, 'GITHUB_TOKEN', None)
                 fetched_pr_data = await fetch_pr_data(repo_owner, repo_name, pr_number, webhook_token)
                 if fetched_pr_data:
-                    await upsert_pr(db, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data)
-                    
-                    # Get the newly created PR ID
-                    new_result = await db.prepare(
-                        'SELECT id FROM prs WHERE pr_url = ?'
-                    ).bind(pr_url).first()
-                    new_pr_id = new_result.to_py()['id'] if new_result else None
+                    # Insert and read back the newly created PR ID in one round-trip
+                    batch_results = await run_batch(db, [
+                        build_upsert_stmt(db, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data),
+                        prepared(db, _SELECT_PR_ID_BY_URL_SQL).bind(pr_url)
+                    ])
+                    new_rows = batch_results[-1].results
+                    new_pr_id = new_rows[0].id if new_rows.length else None
                     
                     return Response.new(
                         json.dumps({
@@ -1151,7 +1334,7 @@ async def handle_github_webhook(request, env):
                             'data': fetched_pr_data,
                             'message': f'PR #{pr_number} has been added to tracking'
                         }),
-                        {'headers': {'Content-Type': 'application/json'}}
+                        _JSON_200_INIT
                     )
                 else:
                     await notify_slack_error(
@@ -1165,8 +1348,8 @@ async def handle_github_webhook(request, env):
                         },
                     )
                     return Response.new(
-                        json.dumps({'error': 'Failed to fetch PR data from GitHub'}),
-                        {'status': 500, 'headers': {'Content-Type': 'application/json'}}
+                        _GITHUB_FETCH_FAILED_BODY,
+                        _JSON_500_INIT
                     )
             
             if not result:
@@ -1176,19 +1359,15 @@ async def handle_github_webhook(request, env):
                         'success': True,
                         'message': 'PR not tracked, ignoring webhook'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
             
             pr_id = result.to_py()['id']
             
             # Handle closed/merged PRs - remove from database
             if action == 'closed' or merged or state == 'closed':
-                # Invalidate caches
-                await invalidate_readiness_cache(env, pr_id)
-                await invalidate_timeline_cache(env, repo_owner, repo_name, pr_number)
-                
-                # Delete the PR
-                await db.prepare('DELETE FROM prs WHERE id = ?').bind(pr_id).run()
+                # Delete the PR and its cached timeline
+                await _remove_tracked_pr(db, pr_id, repo_owner, repo_name, pr_number)
                 
                 status_msg = 'merged' if merged else 'closed'
                 return Response.new(
@@ -1200,7 +1379,7 @@ async def handle_github_webhook(request, env):
                         'status': status_msg,
                         'message': f'PR #{pr_number} has been {status_msg} and removed from tracking'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
             
             # Handle reopened PRs - re-add to tracking if it was tracked before
@@ -1209,10 +1388,10 @@ async def handle_github_webhook(request, env):
                 webhook_token = getattr(env, 'GITHUB_TOKEN', None)
                 fetched_pr_data = await fetch_pr_data(repo_owner, repo_name, pr_number, webhook_token)
                 if fetched_pr_data:
-                    await upsert_pr(db, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data)
-                    # Invalidate caches
-                    await invalidate_readiness_cache(env, pr_id)
-                    await invalidate_timeline_cache(env, repo_owner, repo_name, pr_number)
+                    # Store fresh data and invalidate caches in one D1 batch
+                    await run_batch(db, _update_tracked_pr_stmts(
+                        db, pr_id, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data
+                    ))
                     
                     return Response.new(
                         json.dumps({
@@ -1223,7 +1402,7 @@ async def handle_github_webhook(request, env):
                             'data': fetched_pr_data,
                             'message': f'PR #{pr_number} has been reopened'
                         }),
-                        {'headers': {'Content-Type': 'application/json'}}
+                        _JSON_200_INIT
                     )
             
             # Handle synchronized (new commits) or edited PRs - update data
@@ -1232,10 +1411,10 @@ async def handle_github_webhook(request, env):
                 webhook_token = getattr(env, 'GITHUB_TOKEN', None)
                 fetched_pr_data = await fetch_pr_data(repo_owner, repo_name, pr_number, webhook_token)
                 if fetched_pr_data:
-                    await upsert_pr(db, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data)
-                    # Invalidate caches to force fresh analysis
-                    await invalidate_readiness_cache(env, pr_id)
-                    await invalidate_timeline_cache(env, repo_owner, repo_name, pr_number)
+                    # Store fresh data and invalidate caches (forcing fresh analysis) in one D1 batch
+                    await run_batch(db, _update_tracked_pr_stmts(
+                        db, pr_id, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data
+                    ))
                     
                     return Response.new(
                         json.dumps({
@@ -1246,7 +1425,7 @@ async def handle_github_webhook(request, env):
                             'data': fetched_pr_data,
                             'message': f'PR #{pr_number} has been updated'
                         }),
-                        {'headers': {'Content-Type': 'application/json'}}
+                        _JSON_200_INIT
                     )
         
         # Handle other event types - update PR data to refresh behind_by and mergeable_state
@@ -1284,7 +1463,7 @@ async def handle_github_webhook(request, env):
                         'success': True,
                         'message': f'Received {event_type} event, insufficient PR data to update'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
             
             # Update all tracked PRs associated with this event
@@ -1296,9 +1475,7 @@ async def handle_github_webhook(request, env):
             
             for pr_number, repo_owner, repo_name in prs_to_update:
                 pr_url = f"https://github.com/{repo_owner}/{repo_name}/pull/{pr_number}"
-                result = await db.prepare(
-                    'SELECT id FROM prs WHERE pr_url = ?'
-                ).bind(pr_url).first()
+                result = await prepared(db, _SELECT_PR_ID_BY_URL_SQL).bind(pr_url).first()
                 
                 if not result:
                     # PR not being tracked - skip it
@@ -1322,7 +1499,7 @@ async def handle_github_webhook(request, env):
                         'success': True,
                         'message': f'Received {event_type} event for untracked PR(s), no updates performed'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
             
             # Step 2: Batch fetch PR data from GitHub using GraphQL
@@ -1333,23 +1510,24 @@ async def handle_github_webhook(request, env):
             webhook_token = getattr(env, 'GITHUB_TOKEN', None)
             batch_results = await fetch_multiple_prs_batch(prs_to_fetch, webhook_token)
             
-            # Step 3: Update database with fetched data
+            # Step 3: Update database with fetched data, invalidating caches to
+            # force fresh analysis, as a single D1 batch for all PRs
+            update_stmts = []
             for pr_number, repo_owner, repo_name, pr_id, pr_url in tracked_prs:
                 key = (repo_owner, repo_name, pr_number)
                 fetched_pr_data = batch_results.get(key)
                 
                 if fetched_pr_data:
-                    try:
-                        await upsert_pr(db, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data)
-                        # Invalidate caches to force fresh analysis
-                        await invalidate_readiness_cache(env, pr_id)
-                        await invalidate_timeline_cache(env, repo_owner, repo_name, pr_number)
-                        updated_prs.append({'pr_id': pr_id, 'pr_number': pr_number})
-                    except Exception as update_error:
-                        print(f"Error updating PR #{pr_number} in {repo_owner}/{repo_name}: {str(update_error)}")
+                    update_stmts.extend(_update_tracked_pr_stmts(
+                        db, pr_id, pr_url, repo_owner, repo_name, pr_number, fetched_pr_data
+                    ))
+                    updated_prs.append({'pr_id': pr_id, 'pr_number': pr_number})
                 else:
                     print(f"Failed to fetch PR data for #{pr_number} in {repo_owner}/{repo_name} during {event_type} event")
             
+            if update_stmts:
+                await run_batch(db, update_stmts)
+            
             # Return response with info about all updated PRs
             if updated_prs:
                 return Response.new(
@@ -1359,7 +1537,7 @@ async def handle_github_webhook(request, env):
                         'updated_prs': updated_prs,
                         'message': f'Updated {len(updated_prs)} PR(s) from {event_type} event (batch API call)'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
             else:
                 # No tracked PRs were updated
@@ -1368,7 +1546,7 @@ async def handle_github_webhook(request, env):
                         'success': True,
                         'message': f'Received {event_type} event for untracked PR(s), no updates performed'
                     }),
-                    {'headers': {'Content-Type': 'application/json'}}
+                    _JSON_200_INIT
                 )
         
         # Unknown event type
@@ -1377,16 +1555,12 @@ async def handle_github_webhook(request, env):
                 'success': True,
                 'message': f'Received {event_type} event, no handler configured'
             }),
-            {'headers': {'Content-Type': 'application/json'}}
+            _JSON_200_INIT
         )
         
     except Exception as e:
         print(f"Error handling webhook: {type(e).__name__}: {str(e)}")
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_github_webhook'})
-        return Response.new(
-            json.dumps({'error': f"{type(e).__name__}: {str(e)}"}),
-            {'status': 500, 'headers': {'Content-Type': 'application/json'}}
-        )
+        return await _internal_error_response(env, e, 'handle_github_webhook')
 
 async def handle_pr_timeline(request, env, path):
     """
@@ -1398,19 +1572,14 @@ async def handle_pr_timeline(request, env, path):
     """
     try:
         # Extract PR ID from path: /api/prs/123/timeline
-        path_parts = path.split('/')
-        if len(path_parts) < 4 or not path_parts[3].isdigit():
-            return Response.new(json.dumps({'error': 'Invalid PR ID in path'}),
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
-        pr_id = path_parts[3]
+        m = _PR_ID_RE.match(path)
+        if not m:
+            return Response.new(_INVALID_PR_ID_BODY,
+                              _JSON_400_INIT)
+        pr_id = int(m.group(1))
         
         # Get client IP for rate limiting
-        client_ip = (
-            request.headers.get('cf-connecting-ip') or
-            (request.headers.get('x-forwarded-for') or '').split(',')[0].strip() or
-            request.headers.get('x-real-ip') or
-            'unknown'
-        )
+        client_ip = get_client_ip(request)
         
         # Check rate limit
         allowed, retry_after = check_rate_limit(client_ip)
@@ -1432,20 +1601,19 @@ async def handle_pr_timeline(request, env, path):
                 }
             )
         
-        # Get PR details from database
+        # Get PR details from database while resolving the GitHub token
+        # (the OAuth cookie decrypt doesn't depend on the row)
         db = get_db(env)
-        result = await db.prepare(
-            'SELECT * FROM prs WHERE id = ?'
-        ).bind(pr_id).first()
+        result, token_info = await asyncio.gather(
+            prepared(db, _SELECT_PR_SUMMARY_BY_ID_SQL).bind(pr_id).first(),
+            resolve_github_token(request, env)
+        )
         
         if not result:
-            return Response.new(json.dumps({'error': 'PR not found'}), 
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+            return Response.new(_PR_NOT_FOUND_BODY, 
+                              _JSON_404_INIT)
         
         pr = result.to_py()
-        
-        # Fetch timeline data from GitHub
-        token_info = await resolve_github_token(request, env)
         github_token = token_info['token']
 
         timeline_data = await fetch_pr_timeline_data(
@@ -1458,14 +1626,12 @@ async def handle_pr_timeline(request, env, path):
         
         # Build unified timeline
         timeline = build_pr_timeline(timeline_data)
-        
-        # Convert datetime objects to ISO strings for JSON serialization
-        timeline_json = []
+        # timestamp_epoch is an internal sort key, not part of the API response;
+        # the events were built for this request, so drop it in place
         for event in timeline:
-            event_copy = event.copy()
-            event_copy['timestamp'] = event['timestamp'].isoformat()
-            timeline_json.append(event_copy)
+            del event['timestamp_epoch']
         
+        # Event timestamps are datetimes; _json_default serializes them in place
         return Response.new(json.dumps({
             'pr': {
                 'id': pr['id'],
@@ -1474,14 +1640,12 @@ async def handle_pr_timeline(request, env, path):
                 'repo': f"{pr['repo_owner']}/{pr['repo_name']}",
                 'number': pr['pr_number']
             },
-            'timeline': timeline_json,
-            'event_count': len(timeline_json)
-        }), 
-                          {'headers': {'Content-Type': 'application/json'}})
+            'timeline': timeline,
+            'event_count': len(timeline)
+        }, default=_json_default), 
+                          _JSON_200_INIT)
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_pr_timeline'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}), 
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_pr_timeline')
 
 async def handle_pr_review_analysis(request, env, path):
     """
@@ -1493,19 +1657,14 @@ async def handle_pr_review_analysis(request, env, path):
     """
     try:
         # Extract PR ID from path: /api/prs/123/review-analysis
-        path_parts = path.split('/')
-        if len(path_parts) < 4 or not path_parts[3].isdigit():
-            return Response.new(json.dumps({'error': 'Invalid PR ID in path'}),
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
-        pr_id = path_parts[3]
+        m = _PR_ID_RE.match(path)
+        if not m:
+            return Response.new(_INVALID_PR_ID_BODY,
+                              _JSON_400_INIT)
+        pr_id = int(m.group(1))
         
         # Get client IP for rate limiting
-        client_ip = (
-            request.headers.get('cf-connecting-ip') or
-            (request.headers.get('x-forwarded-for') or '').split(',')[0].strip() or
-            request.headers.get('x-real-ip') or
-            'unknown'
-        )
+        client_ip = get_client_ip(request)
         
         # Check rate limit
         allowed, retry_after = check_rate_limit(client_ip)
@@ -1527,20 +1686,19 @@ async def handle_pr_review_analysis(request, env, path):
                 }
             )
         
-        # Get PR details from database
+        # Get PR details from database while resolving the GitHub token
+        # (the OAuth cookie decrypt doesn't depend on the row)
         db = get_db(env)
-        result = await db.prepare(
-            'SELECT * FROM prs WHERE id = ?'
-        ).bind(pr_id).first()
+        result, token_info = await asyncio.gather(
+            prepared(db, _SELECT_PR_SUMMARY_BY_ID_SQL).bind(pr_id).first(),
+            resolve_github_token(request, env)
+        )
         
         if not result:
-            return Response.new(json.dumps({'error': 'PR not found'}), 
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
+            return Response.new(_PR_NOT_FOUND_BODY, 
+                              _JSON_404_INIT)
         
         pr = result.to_py()
-        
-        # Fetch timeline data from GitHub
-        token_info = await resolve_github_token(request, env)
         github_token = token_info['token']
 
         timeline_data = await fetch_pr_timeline_data(env, 
@@ -1585,11 +1743,9 @@ async def handle_pr_review_analysis(request, env, path):
             },
             'feedback_loops': review_data['feedback_loops']
         }), 
-                          {'headers': {'Content-Type': 'application/json'}})
+                          _JSON_200_INIT)
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_pr_review_analysis'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}), 
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_pr_review_analysis')
 
 async def _run_readiness_analysis(env, pr, pr_id, github_token):
     """
@@ -1628,7 +1784,7 @@ async def _run_readiness_analysis(env, pr, pr_id, github_token):
         if review_status != original_review_status:
             # Update review_status in database only if it actually changed
             db = get_db(env)
-            await db.prepare(
+            await prepared(db,
                 'UPDATE prs SET review_status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
             ).bind(review_status, pr_id).run()
             pr['review_status'] = review_status
@@ -1691,6 +1847,39 @@ async def _run_readiness_analysis(env, pr, pr_id, github_token):
         return None
 
 
+async def _load_and_analyze_readiness(env, pr_id, token_info_awaitable):
+    """Load a PR row and run readiness analysis for it.
+    
+    Returns:
+        Tuple of (pr_found, response_data); response_data is None if the PR
+        is not tracked or the analysis failed
+    """
+    # Get PR details from database while resolving the GitHub token
+    # (the OAuth cookie decrypt doesn't depend on the row)
+    db = get_db(env)
+    result, token_info = await asyncio.gather(
+        prepared(db, _SELECT_PR_BY_ID_SQL).bind(pr_id).first(),
+        token_info_awaitable
+    )
+    
+    if not result:
+        return (False, None)
+    
+    pr = result.to_py()
+    
+    # Run readiness analysis
+    response_data = await _run_readiness_analysis(env, pr, pr_id, token_info['token'])
+    
+    if response_data is None:
+        await notify_slack_error(
+            getattr(env, 'SLACK_ERROR_WEBHOOK', ''),
+            error_type='ReadinessError',
+            error_message='Failed to compute readiness analysis',
+            context={'handler': 'handle_pr_readiness', 'pr_id': str(pr_id)},
+        )
+    return (True, response_data)
+
+
 async def handle_pr_readiness(request, env, path):
     """
     GET /api/prs/{id}/readiness
@@ -1704,70 +1893,34 @@ async def handle_pr_readiness(request, env, path):
     """
     try:
         # Extract PR ID from path: /api/prs/123/readiness
-        path_parts = path.split('/')
-        if len(path_parts) < 4 or not path_parts[3].isdigit():
-            return Response.new(json.dumps({'error': 'Invalid PR ID in path'}),
-                              {'status': 400, 'headers': {'Content-Type': 'application/json'}})
-        pr_id = path_parts[3]
-        
-        # Check cache first
-        cached_result = await get_readiness_cache(env, pr_id)
-        if cached_result:
+        m = _PR_ID_RE.match(path)
+        if not m:
+            return Response.new(_INVALID_PR_ID_BODY, _JSON_400_INIT)
+        # Kept as a string: readiness cache entries are keyed by the string ID
+        pr_id = m.group(1)
+        
+        # Check cache first (already serialized, so hits skip json.dumps)
+        cached_body = await get_readiness_cache_body(env, pr_id)
+        if cached_body:
             # Return cached response with cache headers
-            return Response.new(
-                json.dumps(cached_result),
-                {
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'X-Cache': 'HIT',
-                        'Cache-Control': f'private, max-age={_READINESS_CACHE_TTL}'
-                    }
-                }
-            )
+            return Response.new(cached_body, _READINESS_HIT_INIT)
         
-        # Get PR details from database
-        db = get_db(env)
-        result = await db.prepare(
-            'SELECT * FROM prs WHERE id = ?'
-        ).bind(pr_id).first()
-        
-        if not result:
-            return Response.new(json.dumps({'error': 'PR not found'}), 
-                              {'status': 404, 'headers': {'Content-Type': 'application/json'}})
-        
-        pr = result.to_py()
-        
-        # Fetch timeline data from GitHub
-        token_info = await resolve_github_token(request, env)
-        github_token = token_info['token']
+        # Load the row and analyze with this caller's token; the analysis fills the
+        # readiness cache for later requests (Workers can't share pending I/O across requests)
+        pr_found, response_data = await _load_and_analyze_readiness(
+            env, pr_id, resolve_github_token(request, env)
+        )
         
-        # Run readiness analysis
-        response_data = await _run_readiness_analysis(env, pr, pr_id, github_token)
+        if not pr_found:
+            return Response.new(_PR_NOT_FOUND_BODY, _JSON_404_INIT)
         
         if response_data is None:
-            await notify_slack_error(
-                getattr(env, 'SLACK_ERROR_WEBHOOK', ''),
-                error_type='ReadinessError',
-                error_message='Failed to compute readiness analysis',
-                context={'handler': 'handle_pr_readiness', 'pr_id': str(pr_id)},
-            )
             return Response.new(json.dumps({'error': 'Failed to compute readiness analysis'}),
-                              {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+                              _JSON_500_INIT)
         
-        return Response.new(
-            json.dumps(response_data),
-            {
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'X-Cache': 'MISS',
-                    'Cache-Control': f'private, max-age={_READINESS_CACHE_TTL}'
-                }
-            }
-        )
+        return Response.new(json.dumps(response_data), _READINESS_MISS_INIT)
     except Exception as e:
-        await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), e, context={'handler': 'handle_pr_readiness'})
-        return Response.new(json.dumps({'error': f"{type(e).__name__}: {str(e)}"}), 
-                          {'status': 500, 'headers': {'Content-Type': 'application/json'}})
+        return await _internal_error_response(env, e, 'handle_pr_readiness')
 
 
 
@@ -1785,7 +1938,7 @@ async def handle_scheduled_refresh(env):
         db = get_db(env)
 
         # Fetch only the fields needed to build the batch request
-        stmt = db.prepare('SELECT id, pr_url, repo_owner, repo_name, pr_number FROM prs')
+        stmt = prepared(db, 'SELECT id, pr_url, repo_owner, repo_name, pr_number FROM prs')
         result = await stmt.all()
 
         if not result or not result.results:
@@ -1809,6 +1962,7 @@ async def handle_scheduled_refresh(env):
         updated = 0
         removed = 0
         errors = 0
+        ts = utc_now_iso()
 
         for (owner, repo, pr_number), pr_data in batch_results.items():
             pr_id, pr_url = pr_lookup[(owner, repo, pr_number)]
@@ -1822,14 +1976,14 @@ async def handle_scheduled_refresh(env):
             if pr_data.get('is_merged') or pr_data.get('state') == 'closed':
                 await invalidate_readiness_cache(env, pr_id)
                 await invalidate_timeline_cache(env, owner, repo, pr_number)
-                await db.prepare('DELETE FROM prs WHERE id = ?').bind(pr_id).run()
+                await prepared(db, _DELETE_PR_BY_ID_SQL).bind(pr_id).run()
                 status_msg = 'merged' if pr_data.get('is_merged') else 'closed'
                 print(f"Scheduled refresh: removed {status_msg} PR {owner}/{repo}#{pr_number}")
                 removed += 1
                 continue
 
             try:
-                await upsert_pr(db, pr_url, owner, repo, pr_number, pr_data)
+                await upsert_pr(db, pr_url, owner, repo, pr_number, pr_data, ts)
                 await invalidate_readiness_cache(env, pr_id)
                 await invalidate_timeline_cache(env, owner, repo, pr_number)
                 updated += 1
@@ -4,6 +4,7 @@ from js import Response, URL, Object
 import time as _time
 from pyodide.ffi import to_js
 from slack_notifier import notify_slack_exception, notify_slack_error
+from utils import get_client_ip
 # Import all handlers
 from handlers import (
     handle_add_pr,
@@ -21,7 +22,8 @@ from handlers import (
     handle_pr_timeline,
     handle_pr_review_analysis,
     handle_pr_readiness,
-    handle_scheduled_refresh
+    handle_scheduled_refresh,
+    _MAX_PR_ID_DIGITS
 )
 from auth_handlers import (
     handle_auth_login,
@@ -64,13 +66,51 @@ def slack_budget_allow(limit, window):
         return True, 0
     return False, int(window - (now - ws)) + 1
 
-def _get_client_ip(request):
-    return (
-        request.headers.get('cf-connecting-ip')
-        or (request.headers.get('x-forwarded-for') or '').split(',')[0].strip()
-        or request.headers.get('x-real-ip')
-        or 'unknown'
-    )
+# CORS headers
+# NOTE: '*' allows all origins for public access. In production, consider
+# restricting to specific domains by setting this to your domain(s).
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, x-github-token',
+}
+_CORS_HEADER_ITEMS = tuple(_CORS_HEADERS.items())
+
+# Response inits built by on_fetch itself, converted to JS once per isolate
+# Preflight answers are 204 with no body, and let browsers reuse them for a day
+# instead of sending an OPTIONS request ahead of every cross-origin API call
+_CORS_PREFLIGHT_INIT = to_js(
+    {'status': 204, 'headers': {**_CORS_HEADERS, 'Access-Control-Max-Age': '86400'}},
+    dict_converter=Object.fromEntries
+)
+_ROOT_FALLBACK_INIT = to_js(
+    {'status': 200, 'headers': {**_CORS_HEADERS, 'Content-Type': 'text/html'}},
+    dict_converter=Object.fromEntries
+)
+_NOT_FOUND_INIT = to_js({'status': 404, 'headers': _CORS_HEADERS}, dict_converter=Object.fromEntries)
+_INTERNAL_ERROR_INIT = to_js(
+    {'status': 500, 'headers': {**_CORS_HEADERS, 'Content-Type': 'application/json'}},
+    dict_converter=Object.fromEntries
+)
+
+def _apply_cors(response):
+    """Set the CORS headers on a handler response, fetching its Headers proxy once"""
+    headers = response.headers
+    for key, value in _CORS_HEADER_ITEMS:
+        headers.set(key, value)
+    return response
+
+def _url_path(url):
+    """Return the pathname of an absolute request URL without parsing it into a JS URL.
+    
+    request.url is already serialized by the runtime (normalized and percent-encoded),
+    so the path is everything from the first '/' after the scheme up to any '?'.
+    """
+    path_start = url.find('/', url.find('://') + 3)
+    if path_start < 0:
+        return '/'
+    query_start = url.find('?', path_start)
+    return url[path_start:query_start] if query_start >= 0 else url[path_start:]
 
 def json_response(data: dict, status: int, extra_headers: dict | None = None):
     headers = {'Content-Type': 'application/json'}
@@ -83,32 +123,221 @@ def json_response(data: dict, status: int, extra_headers: dict | None = None):
         dict_converter=Object.fromEntries
     )
     return Response.new(json.dumps(data), init)
-async def on_fetch(request, env):
-    """Main request handler"""
-    slack_webhook = getattr(env, 'SLACK_ERROR_WEBHOOK', '')
 
+
+async def _route_list_prs(request, env):
+    """GET /api/prs - parse the list query parameters and list PRs"""
+    # The only route that reads the query string, so the only one that builds a URL
     url = URL.new(request.url)
-    path = url.pathname
+    repo = url.searchParams.get('repo')
+    org = url.searchParams.get('org')
+    author = url.searchParams.get('author')
+    page = url.searchParams.get('page')
+    per_page_param = url.searchParams.get('per_page')
+    sort_by = url.searchParams.get('sort_by')
+    sort_dir = url.searchParams.get('sort_dir')
     
-    # Strip /leaf prefix
-    if path == '/leaf': 
-        path = '/'
-    elif path.startswith('/leaf/'): 
-        path = path[5:]  # Remove '/leaf' (5 characters)
+    # Parse and validate per_page parameter
+    per_page = 30  # default
+    if per_page_param:
+        try:
+            per_page = int(per_page_param)
+            # Validate per_page is in allowed range (10-1000)
+            if per_page < 10:
+                per_page = 10
+            elif per_page > 1000:
+                per_page = 1000
+        except (ValueError, TypeError):
+            per_page = 30
     
-    # CORS headers
-    # NOTE: '*' allows all origins for public access. In production, consider
-    # restricting to specific domains by setting this to your domain(s).
-    cors_headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type, x-github-token',
-    }
+    return await handle_list_prs(
+        env,
+        repo,
+        page if page else 1,
+        per_page,
+        sort_by,
+        sort_dir,
+        org,
+        author,
+        request.headers.get('If-None-Match')
+    )
+
+
+async def _route_error_test(request, env):
+    """POST /api/error-test - send a test error to Slack"""
+    ip = get_client_ip(request)
+
+    # Rate limit (keep it strict; default 1/min/IP)
+    limit = int(getattr(env, 'ERROR_TEST_RATE_LIMIT', 1) or 1)
+    window = int(getattr(env, 'ERROR_TEST_RATE_WINDOW', 60) or 60)
+    allowed, retry_after = check_rate_limit_bucket('error-test', ip, limit, window)
+    if not allowed:
+        return json_response(
+            {'ok': False, 'reason': 'Rate limit exceeded'},
+            429,
+            extra_headers={'Retry-After': str(retry_after)}
+        )
+
+    slack_webhook = (getattr(env, 'SLACK_ERROR_WEBHOOK', '') or '').strip()
+    if not slack_webhook:
+        return json_response({'ok': False, 'reason': 'SLACK_ERROR_WEBHOOK not set'}, 500)
+
+    slack_ok = await notify_slack_error(
+        slack_webhook,
+        error_type='ErrorTest',
+        error_message='Slack error-test triggered',
+        context={'source': '/api/error-test', 'url': str(request.url), 'ip': ip},
+        stack_trace=None,
+    )
+    if slack_ok:
+        response = json_response({'ok': True, 'sent_to_slack': True}, 200)
+    else:
+        print('Error-test Slack send failed')
+        response = json_response({'ok': False, 'reason': 'Slack send failed (check worker logs)'}, 502)
+
+    return response
+
+
+async def _route_client_error(request, env):
+    """POST /api/client-error - frontend client-error reporting endpoint"""
+    ip = get_client_ip(request)
+
+    # Rate limit per IP (default 10/min)
+    limit = int(getattr(env, 'CLIENT_ERROR_RATE_LIMIT', 5) or 5)
+    window = int(getattr(env, 'CLIENT_ERROR_RATE_WINDOW', 60) or 60)
+    allowed, retry_after = check_rate_limit_bucket('client-error', ip, limit, window)
+    if not allowed:
+        return json_response(
+            {'error': 'Rate limit exceeded'},
+            429,
+            extra_headers={'Retry-After': str(retry_after)}
+        )
+
+    # Payload cap (default 8KB)
+    max_bytes = int(getattr(env, 'CLIENT_ERROR_MAX_BYTES', 8192) or 8192)
+    try:
+        content_len = int(request.headers.get('content-length') or '0')
+    except Exception:
+        content_len = 0
+    if content_len and content_len > max_bytes:
+        return json_response({'error': 'Payload too large'}, 413)
 
+    # Parse JSON once (tolerate beacon text/plain too)
+    body = {}
     try:
+        body = (await request.json()).to_py()
+    except Exception:
+        try:
+            text = await request.text()
+            body = json.loads(text) if text else {}
+        except Exception:
+            body = {}
+
+    error_type = str(body.get('error_type', 'FrontendError'))[:80]
+    error_message = str(body.get('message', 'Unknown frontend error'))[:300]
+    stack_trace = (str(body.get('stack', ''))[:2000] or None)
+
+    url_here = str(body.get('url', ''))[:200] or ''
+    line = str(body.get('line', ''))[:20] or ''
+    col = str(body.get('col', ''))[:20] or ''
+    resource = str(body.get('resource', ''))[:200] or ''
+
+    # Dedupe key: same error signature shouldn't spam Slack
+    dedupe_ttl = int(getattr(env, 'CLIENT_ERROR_DEDUPE_TTL', 300) or 300)  # 5 min default
+    signature = f"{error_type}|{error_message}|{url_here}|{line}|{col}|{resource}"
+    should_slack = should_send_dedupe(signature, dedupe_ttl)
+
+    # Global Slack cap (default 20/min total)
+    slack_cap = int(getattr(env, 'SLACK_MAX_PER_MIN', 20) or 20)
+    slack_allowed, slack_retry = slack_budget_allow(slack_cap, 60)
+
+    ctx = {k: str(v)[:200] for k, v in body.items() if k not in ('error_type', 'message', 'stack')}
+    ctx['source'] = 'frontend'
+    ctx['ip'] = ip
+    ctx['dedupe'] = '1' if should_slack else '0'
+
+    slack_sent = False
+    if should_slack and slack_allowed:
+        slack_sent = await notify_slack_error(
+            getattr(env, 'SLACK_ERROR_WEBHOOK', ''),
+            error_type=error_type,
+            error_message=error_message,
+            context=ctx,
+            stack_trace=stack_trace,
+        )
+        if not slack_sent:
+            print('Slack: failed to report frontend error')
+    else:
+        if not should_slack:
+            print("Slack: deduped client-error")
+        elif not slack_allowed:
+            print(f"Slack: global cap reached, retry after {slack_retry}s")
+
+    return json_response({'ok': True, 'slack_sent': slack_sent, 'deduped': (not should_slack)}, 200)
+
+
+# GET /api/prs/{id}/{sub-resource} handlers, keyed by the segment after the ID.
+# Each validates the ID itself (from the full path) and answers 400 if it is bad.
+_PR_SUBRESOURCE_ROUTES = {
+    'timeline': handle_pr_timeline,
+    'review-analysis': handle_pr_review_analysis,
+    'readiness': handle_pr_readiness,
+}
+
+
+async def _route_pr_subresource(request, env, path):
+    """GET /api/prs/{id} and its /timeline, /review-analysis and /readiness sub-resources"""
+    # One split separates the ID from the sub-resource name, if any
+    pr_id_str, has_sub, sub = path[len('/api/prs/'):].partition('/')
+    if not has_sub:
+        # Plain ASCII digits that fit a D1 integer; anything else is not a PR ID
+        if pr_id_str.isascii() and pr_id_str.isdigit() and len(pr_id_str) <= _MAX_PR_ID_DIGITS:
+            return await handle_get_pr(env, int(pr_id_str))
+        return None
+    handler = _PR_SUBRESOURCE_ROUTES.get(sub)
+    if handler is None:
+        return None
+    return await handler(request, env, path)
+
+
+# API routes with a fixed path, keyed by (method, path). Every entry takes
+# (request, env) and returns an awaitable Response; CORS is applied by
+# on_fetch. Per-PR paths (/api/prs/{id}/...) go through _route_pr_subresource.
+_ROUTES = {
+    ('GET', '/api/prs/updates'): lambda request, env: handle_pr_updates_check(env),
+    ('GET', '/api/prs'): _route_list_prs,
+    ('POST', '/api/prs'): lambda request, env: handle_add_pr(request, env),
+    ('GET', '/api/repos'): lambda request, env: handle_list_repos(env),
+    ('GET', '/api/authors'): lambda request, env: handle_list_authors(env),
+    ('POST', '/api/refresh'): lambda request, env: handle_refresh_pr(request, env),
+    ('POST', '/api/refresh-batch'): lambda request, env: handle_batch_refresh_prs(request, env),
+    ('POST', '/api/refresh-org'): lambda request, env: handle_refresh_org(request, env),
+    ('GET', '/api/rate-limit'): lambda request, env: handle_rate_limit(request, env),
+    ('GET', '/api/auth/login'): lambda request, env: handle_auth_login(request, env),
+    ('GET', '/api/auth/callback'): lambda request, env: handle_auth_callback(request, env),
+    ('GET', '/api/auth/user'): lambda request, env: handle_auth_user(request, env),
+    ('POST', '/api/auth/logout'): lambda request, env: handle_auth_logout(request, env),
+    ('GET', '/api/status'): lambda request, env: handle_status(env),
+    ('POST', '/api/github/webhook'): lambda request, env: handle_github_webhook(request, env),
+    ('POST', '/api/error-test'): _route_error_test,
+    ('POST', '/api/client-error'): _route_client_error,
+}
+
+
+async def on_fetch(request, env):
+    """Main request handler"""
+    path = _url_path(request.url)
+    
+    # Strip /leaf prefix ('/leaf' and '/leaf/...', but not e.g. '/leafy')
+    if path.startswith('/leaf') and (len(path) == 5 or path[5] == '/'):
+        path = path[5:] or '/'  # Remove '/leaf' (5 characters)
+    
+    try:
+        method = request.method
+
         # Handle CORS preflight
-        if request.method == 'OPTIONS':
-            return Response.new('', {'headers': cors_headers})
+        if method == 'OPTIONS':
+            return Response.new(None, _CORS_PREFLIGHT_INIT)
         
         # Serve HTML for root path 
         if path == '/' or path == '/index.html':
@@ -116,255 +345,29 @@ async def on_fetch(request, env):
             if hasattr(env, 'ASSETS'): 
                 return await env.ASSETS.fetch(request)
             # Fallback: return simple message
-            return Response.new('Please configure assets in wrangler.toml', 
-                              {'status': 200, 'headers': {**cors_headers, 'Content-Type': 'text/html'}})
+            return Response.new('Please configure assets in wrangler.toml', _ROOT_FALLBACK_INIT)
         
         # API endpoints
-        response = None
-        
-        if path == '/api/prs/updates' and request.method == 'GET':
-            response = await handle_pr_updates_check(env)
-        elif path == '/api/prs':
-            if request.method == 'GET':
-                repo = url.searchParams.get('repo')
-                org = url.searchParams.get('org')
-                author = url.searchParams.get('author')
-                page = url.searchParams.get('page')
-                per_page_param = url.searchParams.get('per_page')
-                sort_by = url.searchParams.get('sort_by')
-                sort_dir = url.searchParams.get('sort_dir')
-                
-                # Parse and validate per_page parameter
-                per_page = 30  # default
-                if per_page_param:
-                    try:
-                        per_page = int(per_page_param)
-                        # Validate per_page is in allowed range (10-1000)
-                        if per_page < 10:
-                            per_page = 10
-                        elif per_page > 1000:
-                            per_page = 1000
-                    except (ValueError, TypeError):
-                        per_page = 30
-                
-                response = await handle_list_prs(
-                    env,
-                    repo,
-                    page if page else 1,
-                    per_page,
-                    sort_by,
-                    sort_dir,
-                    org,
-                    author
-                )
-            elif request.method == 'POST':
-                response = await handle_add_pr(request, env)
-        # Single PR endpoint - GET /api/prs/{id}
-        # The '/' check ensures sub-paths like /api/prs/{id}/timeline are not intercepted here
-        elif path.startswith('/api/prs/') and '/' not in path[len('/api/prs/'):] and request.method == 'GET':
-            pr_id_str = path[len('/api/prs/'):]
-            if pr_id_str.isdigit():
-                response = await handle_get_pr(env, int(pr_id_str))
-        elif path == '/api/repos' and request.method == 'GET':
-            response = await handle_list_repos(env)
-        elif path == '/api/authors' and request.method == 'GET':
-            response = await handle_list_authors(env)
-        elif path == '/api/refresh' and request.method == 'POST':
-            response = await handle_refresh_pr(request, env)
-        elif path == '/api/refresh-batch' and request.method == 'POST':
-            response = await handle_batch_refresh_prs(request, env)
-        elif path == '/api/refresh-org' and request.method == 'POST':
-            response = await handle_refresh_org(request, env)
-        elif path == '/api/rate-limit' and request.method == 'GET':
-            response = await handle_rate_limit(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response 
-        elif path == '/api/auth/login' and request.method == 'GET':
-            response = await handle_auth_login(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        elif path == '/api/auth/callback' and request.method == 'GET':
-            response = await handle_auth_callback(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        elif path == '/api/auth/user' and request.method == 'GET':
-            response = await handle_auth_user(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        elif path == '/api/auth/logout' and request.method == 'POST':
-            response = await handle_auth_logout(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        elif path == '/api/status' and request.method == 'GET':
-            response = await handle_status(env)
-        elif path == '/api/github/webhook' and request.method == 'POST':
-            response = await handle_github_webhook(request, env)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        
-        elif path == '/api/error-test' and request.method == 'POST':
-            ip = _get_client_ip(request)
-
-            # Rate limit (keep it strict; default 1/min/IP)
-            limit = int(getattr(env, 'ERROR_TEST_RATE_LIMIT', 1) or 1)
-            window = int(getattr(env, 'ERROR_TEST_RATE_WINDOW', 60) or 60)
-            allowed, retry_after = check_rate_limit_bucket('error-test', ip, limit, window)
-            if not allowed:
-                response = json_response(
-                    {'ok': False, 'reason': 'Rate limit exceeded'},
-                    429,
-                    extra_headers={'Retry-After': str(retry_after)}
-                )
-                for k, v in cors_headers.items():
-                    response.headers.set(k, v)
-                return response
-
-            slack_webhook = (getattr(env, 'SLACK_ERROR_WEBHOOK', '') or '').strip()
-            if not slack_webhook:
-                response = json_response({'ok': False, 'reason': 'SLACK_ERROR_WEBHOOK not set'}, 500)
-                for k, v in cors_headers.items():
-                    response.headers.set(k, v)
-                return response
-
-            slack_ok = await notify_slack_error(
-                slack_webhook,
-                error_type='ErrorTest',
-                error_message='Slack error-test triggered',
-                context={'source': '/api/error-test', 'url': str(request.url), 'ip': ip},
-                stack_trace=None,
-            )
-            if slack_ok:
-                response = json_response({'ok': True, 'sent_to_slack': True}, 200)
-            else:
-                print('Error-test Slack send failed')
-                response = json_response({'ok': False, 'reason': 'Slack send failed (check worker logs)'}, 502)
-
-            for k, v in cors_headers.items():
-                response.headers.set(k, v)
-            return response
-        # Frontend client-error reporting endpoint
-        elif path == '/api/client-error' and request.method == 'POST':
-            ip = _get_client_ip(request)
-
-            # Rate limit per IP (default 10/min)
-            limit = int(getattr(env, 'CLIENT_ERROR_RATE_LIMIT', 5) or 5)
-            window = int(getattr(env, 'CLIENT_ERROR_RATE_WINDOW', 60) or 60)
-            allowed, retry_after = check_rate_limit_bucket('client-error', ip, limit, window)
-            if not allowed:
-                response = json_response(
-                    {'error': 'Rate limit exceeded'},
-                    429,
-                    extra_headers={'Retry-After': str(retry_after)}
-                )
-                for k, v in cors_headers.items():
-                    response.headers.set(k, v)
-                return response
-
-            # Payload cap (default 8KB)
-            max_bytes = int(getattr(env, 'CLIENT_ERROR_MAX_BYTES', 8192) or 8192)
-            try:
-                content_len = int(request.headers.get('content-length') or '0')
-            except Exception:
-                content_len = 0
-            if content_len and content_len > max_bytes:
-                response = json_response({'error': 'Payload too large'}, 413)
-                for k, v in cors_headers.items():
-                    response.headers.set(k, v)
-                return response
-
-            # Parse JSON once (tolerate beacon text/plain too)
-            body = {}
-            try:
-                body = (await request.json()).to_py()
-            except Exception:
-                try:
-                    text = await request.text()
-                    body = json.loads(text) if text else {}
-                except Exception:
-                    body = {}
-
-            error_type = str(body.get('error_type', 'FrontendError'))[:80]
-            error_message = str(body.get('message', 'Unknown frontend error'))[:300]
-            stack_trace = (str(body.get('stack', ''))[:2000] or None)
-
-            url_here = str(body.get('url', ''))[:200] or ''
-            line = str(body.get('line', ''))[:20] or ''
-            col = str(body.get('col', ''))[:20] or ''
-            resource = str(body.get('resource', ''))[:200] or ''
-
-            # Dedupe key: same error signature shouldn't spam Slack
-            dedupe_ttl = int(getattr(env, 'CLIENT_ERROR_DEDUPE_TTL', 300) or 300)  # 5 min default
-            signature = f"{error_type}|{error_message}|{url_here}|{line}|{col}|{resource}"
-            should_slack = should_send_dedupe(signature, dedupe_ttl)
-
-            # Global Slack cap (default 20/min total)
-            slack_cap = int(getattr(env, 'SLACK_MAX_PER_MIN', 20) or 20)
-            slack_allowed, slack_retry = slack_budget_allow(slack_cap, 60)
-
-            ctx = {k: str(v)[:200] for k, v in body.items() if k not in ('error_type', 'message', 'stack')}
-            ctx['source'] = 'frontend'
-            ctx['ip'] = ip
-            ctx['dedupe'] = '1' if should_slack else '0'
-
-            slack_sent = False
-            if should_slack and slack_allowed:
-                slack_sent = await notify_slack_error(
-                    slack_webhook,
-                    error_type=error_type,
-                    error_message=error_message,
-                    context=ctx,
-                    stack_trace=stack_trace,
-                )
-                if not slack_sent:
-                    print('Slack: failed to report frontend error')
-            else:
-                if not should_slack:
-                    print("Slack: deduped client-error")
-                elif not slack_allowed:
-                    print(f"Slack: global cap reached, retry after {slack_retry}s")
-
-            response = json_response({'ok': True, 'slack_sent': slack_sent, 'deduped': (not should_slack)}, 200)
-            for k, v in cors_headers.items():
-                response.headers.set(k, v)
-            return response
-        # Timeline endpoint - GET /api/prs/{id}/timeline
-        elif path.startswith('/api/prs/') and path.endswith('/timeline') and request.method == 'GET':
-            response = await handle_pr_timeline(request, env, path)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        # Review analysis endpoint - GET /api/prs/{id}/review-analysis
-        elif path.startswith('/api/prs/') and path.endswith('/review-analysis') and request.method == 'GET':
-            response = await handle_pr_review_analysis(request, env, path)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
-        # PR readiness endpoint - GET /api/prs/{id}/readiness
-        elif path.startswith('/api/prs/') and path.endswith('/readiness') and request.method == 'GET':
-            response = await handle_pr_readiness(request, env, path)
-            for key, value in cors_headers.items():
-                response.headers.set(key, value)
-            return response
+        route = _ROUTES.get((method, path))
+        if route is not None:
+            response = await route(request, env)
+        elif method == 'GET' and path.startswith('/api/prs/'):
+            response = await _route_pr_subresource(request, env, path)
+        else:
+            response = None
         
         # If no API route matched, try static assets or return 404
         if response is None:
             if hasattr(env, 'ASSETS'): return await env.ASSETS.fetch(request)
-            return Response.new('Not Found', {'status': 404, 'headers': cors_headers})
+            return Response.new('Not Found', _NOT_FOUND_INIT)
         
         # Apply CORS to API responses
-        for key, value in cors_headers.items():
-            if response: response.headers.set(key, value)
-        return response
+        return _apply_cors(response)
 
     except Exception as exc:
         try:
-            await notify_slack_exception(slack_webhook, exc, context={
+            # Looked up only on failure: it is a JS property read the success path never needs
+            await notify_slack_exception(getattr(env, 'SLACK_ERROR_WEBHOOK', ''), exc, context={
                 'path': path,
                 'method': str(request.method),
             })
@@ -372,7 +375,7 @@ async def on_fetch(request, env):
             print(f'Slack: failed to report exception: {slack_err}')
         return Response.new(
             '{"error": "Internal server error"}',
-            {'status': 500, 'headers': {**cors_headers, 'Content-Type': 'application/json'}},
+            _INTERNAL_ERROR_INIT,
         )
 
 
@@ -1,7 +1,13 @@
 """Utility functions for PR parsing and analysis"""
 
+import bisect
+import functools
+import heapq
 import re
+import sys
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 
 # Score multiplier when changes are requested
 # Reduces overall readiness score by 50% when reviewers request changes
@@ -11,6 +17,106 @@ _CHANGES_REQUESTED_SCORE_MULTIPLIER = 0.5
 # Reduces overall readiness score by 33% when mergeable state is 'dirty' (conflicts)
 _MERGE_CONFLICTS_SCORE_MULTIPLIER = 0.67
 
+# Timeline event types that count as reviewer feedback / author activity
+_REVIEWER_EVENT_TYPES = frozenset(('review', 'review_comment'))
+_AUTHOR_EVENT_TYPES = frozenset(('commit', 'issue_comment', 'review_comment'))
+
+# Extracts (type, author, timestamp, epoch, data) from a timeline event dict
+_EVENT_FIELDS = itemgetter('type', 'author', 'timestamp', 'timestamp_epoch', 'data')
+
+# Review classifications that allow a PR to be considered merge ready
+_MERGE_READY_REVIEW_CLASSIFICATIONS = frozenset(('APPROVED', 'AWAITING_REVIEWER', 'ACTIVE'))
+
+# Readiness classification by overall score (for PRs that aren't merge ready):
+# below 40 -> NOT_READY, 40-59 -> NEEDS_WORK, 60+ -> NEARLY_READY
+_READINESS_SCORE_THRESHOLDS = (40, 60)
+_READINESS_SCORE_LABELS = ('NOT_READY', 'NEEDS_WORK', 'NEARLY_READY')
+
+# Who the PR is waiting on, keyed by
+# (reviewer has acted, author has acted, sign of last reviewer - last author action)
+# -> (awaiting_author, awaiting_reviewer)
+_AWAITING_STATES = {
+    (False, False, 0): (False, False),
+    (True, False, 0): (True, False),
+    (False, True, 0): (False, True),
+    (True, True, 1): (True, False),
+    (True, True, -1): (False, True),
+    (True, True, 0): (False, False),
+}
+
+
+@dataclass(slots=True)
+class FeedbackLoop:
+    """A single piece of reviewer feedback and the author's response to it"""
+    reviewer: str
+    feedback_time: datetime
+    feedback_type: str
+    feedback_epoch: int
+    author_responded: bool = False
+    response_time: datetime = None
+    response_type: str = None
+    response_delay_hours: float = None
+
+    def to_dict(self):
+        """Serialize to a JSON-safe dict with ISO 8601 timestamps"""
+        return {
+            'reviewer': self.reviewer,
+            'feedback_time': self.feedback_time.isoformat(),
+            'feedback_type': self.feedback_type,
+            'author_responded': self.author_responded,
+            'response_time': self.response_time.isoformat() if self.response_time else None,
+            'response_type': self.response_type,
+            'response_delay_hours': self.response_delay_hours
+        }
+
+
+# GitHub repo and org/user URL patterns, used with .match()
+_REPO_URL_RE = re.compile(r'https?://github\.com/([^/]+)/([^/]+)(?:/.*)?$')
+_ORG_URL_RE = re.compile(r'https?://github\.com/([A-Za-z0-9_.-]+)\Z')
+
+# GitHub reserved top-level paths that aren't orgs/users
+_RESERVED_GITHUB_PATHS = frozenset((
+    'settings', 'organizations', 'explore', 'marketplace',
+    'notifications', 'new', 'login', 'signup', 'features',
+    'enterprise', 'pricing', 'topics', 'collections',
+    'trending', 'sponsors', 'about', 'security', 'pulls',
+    'issues', 'codespaces', 'discussions'
+))
+
+
+# The URL matchers below are memoized on the normalized URL (including misses).
+# They return tuples so the cached value can't be mutated by callers; the
+# public parse_* functions build a fresh dict from them on every call.
+
+@functools.lru_cache(maxsize=1024)
+def _match_pr_url(url):
+    # Exactly http(s)://github.com/OWNER/REPO/pull/NUMBER with nothing trailing
+    # (Issue #45), checked with plain string ops rather than the regex engine
+    if url.startswith('https://'):
+        parts = url[8:].split('/')
+    elif url.startswith('http://'):
+        parts = url[7:].split('/')
+    else:
+        return None
+    if (len(parts) != 5 or parts[0] != 'github.com' or not parts[1] or not parts[2]
+            or parts[3] != 'pull' or not parts[4].isdecimal()):
+        return None
+    return (parts[1], parts[2], int(parts[4]))
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_repo_url(url):
+    match = _REPO_URL_RE.match(url)
+    return (match.group(1), match.group(2)) if match else None
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_org_url(url):
+    match = _ORG_URL_RE.match(url)
+    if not match or match.group(1).lower() in _RESERVED_GITHUB_PATHS:
+        return None
+    return match.group(1)
+
 
 def parse_pr_url(pr_url):
     """
@@ -28,33 +134,28 @@ def parse_pr_url(pr_url):
     if not pr_url:
         raise ValueError("PR URL is required")
     
-    pr_url = pr_url.strip().rstrip('/')
-    
     # FIX Issue #45: Anchored regex - must match EXACTLY, no trailing junk allowed
-    pattern = r'^https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)$'
-    match = re.match(pattern, pr_url)
+    match = _match_pr_url(pr_url.strip().rstrip('/'))
     
     if not match:
         # FIX Issue #45: Raise error instead of returning None
         raise ValueError("Invalid GitHub PR URL. Format: https://github.com/OWNER/REPO/pull/NUMBER")
     
     return {
-        'owner': match.group(1),
-        'repo': match.group(2),
-        'pr_number': int(match.group(3))
+        'owner': match[0],
+        'repo': match[1],
+        'pr_number': match[2]
     }
 
 
 def parse_repo_url(url):
     """Parse GitHub Repo URL to extract owner and repo name"""
     if not url: return None
-    url = url.strip().rstrip('/')
-    pattern = r'https?://github\.com/([^/]+)/([^/]+)(?:/.*)?$'
-    match = re.match(pattern, url)
+    match = _match_repo_url(url.strip().rstrip('/'))
     if match:
         return {
-            'owner': match.group(1),
-            'repo': match.group(2)
+            'owner': match[0],
+            'repo': match[1]
         }
     return None
 
@@ -65,57 +166,85 @@ def parse_org_url(url):
     """
     if not url:
         return None
-    url = url.strip().rstrip('/')
     # Match org/user URL: github.com/<owner> with no further path segments
-    pattern = r'^https?://github\.com/([A-Za-z0-9_.-]+)$'
-    match = re.match(pattern, url)
-    if match:
-        owner = match.group(1)
-        # Exclude GitHub reserved paths that aren't orgs/users
-        reserved = {'settings', 'organizations', 'explore', 'marketplace',
-                    'notifications', 'new', 'login', 'signup', 'features',
-                    'enterprise', 'pricing', 'topics', 'collections',
-                    'trending', 'sponsors', 'about', 'security', 'pulls',
-                    'issues', 'codespaces', 'discussions'}
-        if owner.lower() in reserved:
-            return None
+    owner = _match_org_url(url.strip().rstrip('/'))
+    if owner:
         return {'owner': owner}
     return None
 
 
-def calculate_review_status(reviews_data):
+def get_client_ip(request):
+    """Best-effort client IP for rate limiting, preferring Cloudflare's header"""
+    headers = request.headers
+    ip = headers.get('cf-connecting-ip')
+    if ip:
+        return ip
+    forwarded = headers.get('x-forwarded-for')
+    if forwarded:
+        ip = forwarded.partition(',')[0].strip()
+        if ip:
+            return ip
+    return headers.get('x-real-ip') or 'unknown'
+
+
+def get_latest_reviews(reviews_data):
+    """
+    Keep only the most recent submitted review per reviewer.
+    
+    Single pass without sorting: GitHub's ISO 8601 timestamps compare
+    chronologically as strings, and '>=' lets the later entry win ties just
+    like the previous stable sort did.
+    
+    Args:
+        reviews_data: List of review objects from GitHub API
+        
+    Returns:
+        Dict mapping reviewer login to their latest review object
+    """
+    latest_reviews = {}
+    for review in reviews_data or ():
+        submitted_at = review.get('submitted_at')
+        # Safely access user field - can be null for deleted accounts
+        user = review.get('user')
+        if not submitted_at or not user or not user.get('login'):
+            continue
+        current = latest_reviews.get(user['login'])
+        if current is None or submitted_at >= current['submitted_at']:
+            latest_reviews[user['login']] = review
+    return latest_reviews
+
+
+def calculate_review_status(reviews_data, latest_reviews=None):
     """
     Calculate overall review status from reviews data.
     
     Args:
         reviews_data: List of review objects from GitHub API
+        latest_reviews: Optional precomputed result of get_latest_reviews()
         
     Returns:
         str: 'pending', 'approved', or 'changes_requested'
     """
-    review_status = 'pending'
-    if reviews_data:
-        # Filter out reviews without submitted_at and sort by timestamp
-        valid_reviews = [r for r in reviews_data if r.get('submitted_at')]
-        sorted_reviews = sorted(valid_reviews, key=lambda x: x.get('submitted_at', ''))
-        latest_reviews = {}
-        for review in sorted_reviews:
-            # Safely access user field - can be null for deleted accounts
-            user = review.get('user')
-            if user and user.get('login'):
-                latest_reviews[user['login']] = review['state']
-
-        # Determine overall status: changes_requested takes precedence over approved
-        if 'CHANGES_REQUESTED' in latest_reviews.values():
-            review_status = 'changes_requested'
-        elif 'APPROVED' in latest_reviews.values():
-            review_status = 'approved'
-    
-    return review_status
+    if latest_reviews is None:
+        latest_reviews = get_latest_reviews(reviews_data)
+    states = {review['state'] for review in latest_reviews.values()}
+    
+    # Determine overall status: changes_requested takes precedence over approved
+    if 'CHANGES_REQUESTED' in states:
+        return 'changes_requested'
+    if 'APPROVED' in states:
+        return 'approved'
+    return 'pending'
+
 
+def utc_now_iso():
+    """Current UTC time as ISO 8601 with a 'Z' suffix, e.g. 2024-01-15T10:30:45.123456Z"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
 
+
+@functools.lru_cache(maxsize=4096)
 def parse_github_timestamp(timestamp_str):
-    """Parse GitHub ISO 8601 timestamp to datetime object"""
+    """Parse GitHub ISO 8601 timestamp to datetime object (memoized, results are immutable)"""
     try:
         # GitHub timestamps are in format: 2024-01-15T10:30:45Z
         return datetime.strptime(timestamp_str.replace('Z', '+00:00'), '%Y-%m-%dT%H:%M:%S%z')
@@ -124,6 +253,16 @@ def parse_github_timestamp(timestamp_str):
         raise ValueError(f"Invalid GitHub timestamp: {timestamp_str!r}") from exc
 
 
+def _parse_event_timestamp(timestamp_str):
+    """Parse a timeline event timestamp, returning None if missing or malformed"""
+    if not timestamp_str:
+        return None
+    try:
+        return parse_github_timestamp(timestamp_str)
+    except ValueError:
+        return None
+
+
 def build_pr_timeline(timeline_data):
     """
     Build unified chronological timeline from PR events
@@ -136,83 +275,115 @@ def build_pr_timeline(timeline_data):
         {
             'type': 'commit' | 'review' | 'review_comment' | 'issue_comment',
             'timestamp': datetime object,
+            'timestamp_epoch': int seconds since epoch (for cheap comparisons),
             'author': str,
             'data': dict with event-specific data
         }
     """
-    events = []
+    commit_events = []
+    review_events = []
+    review_comment_events = []
+    issue_comment_events = []
+    
+    # Malformed items are skipped: non-dicts, a missing or unparseable timestamp,
+    # and a null author/user (a commit whose email isn't linked to a GitHub
+    # account, or a deleted user). Fields are read with defaults, not try/except.
     
     # Process commits
     for commit in timeline_data.get('commits', []):
-        try:
-            commit_data = commit.get('commit', {})
-            author_data = commit_data.get('author', {})
-            
-            events.append({
-                'type': 'commit',
-                'timestamp': parse_github_timestamp(author_data.get('date', '')),
-                'author': commit.get('author', {}).get('login', author_data.get('name', 'Unknown')),
-                'data': {
-                    'sha': commit.get('sha', '')[:7],
-                    'message': commit_data.get('message', '').split('\n')[0]  # First line only
-                }
-            })
-        except Exception:
+        if not isinstance(commit, dict) or commit.get('author', {}) is None:
+            continue
+        commit_data = commit.get('commit') or {}
+        author_data = commit_data.get('author') or {}
+        timestamp = _parse_event_timestamp(author_data.get('date'))
+        if timestamp is None:
             continue  # Skip malformed commits
+        
+        commit_events.append({
+            'type': 'commit',
+            'timestamp': timestamp,
+            'timestamp_epoch': int(timestamp.timestamp()),
+            'author': commit.get('author', {}).get('login') or author_data.get('name') or 'Unknown',
+            'data': {
+                'sha': (commit.get('sha') or '')[:7],
+                'message': (commit_data.get('message') or '').split('\n')[0]  # First line only
+            }
+        })
     
     # Process reviews
     for review in timeline_data.get('reviews', []):
-        try:
-            # Skip pending reviews
-            if review.get('state') == 'PENDING':
-                continue
-            
-            events.append({
-                'type': 'review',
-                'timestamp': parse_github_timestamp(review.get('submitted_at', '')),
-                'author': review.get('user', {}).get('login', 'Unknown'),
-                'data': {
-                    'state': review.get('state', ''),  # APPROVED, CHANGES_REQUESTED, COMMENTED
-                    'body': review.get('body', '')
-                }
-            })
-        except Exception:
+        if not isinstance(review, dict) or review.get('user', {}) is None:
+            continue
+        # Skip pending reviews
+        if review.get('state') == 'PENDING':
+            continue
+        
+        timestamp = _parse_event_timestamp(review.get('submitted_at'))
+        if timestamp is None:
             continue
+        
+        review_events.append({
+            'type': 'review',
+            'timestamp': timestamp,
+            'timestamp_epoch': int(timestamp.timestamp()),
+            'author': review.get('user', {}).get('login', 'Unknown'),
+            'data': {
+                # Interned: API strings are fresh objects, and the state is
+                # compared against constants repeatedly during analysis
+                'state': sys.intern(review.get('state') or ''),  # APPROVED, CHANGES_REQUESTED, COMMENTED
+                'body': review.get('body', '')
+            }
+        })
     
     # Process review comments (inline code comments)
     for comment in timeline_data.get('review_comments', []):
-        try:
-            events.append({
-                'type': 'review_comment',
-                'timestamp': parse_github_timestamp(comment.get('created_at', '')),
-                'author': comment.get('user', {}).get('login', 'Unknown'),
-                'data': {
-                    'body': comment.get('body', ''),
-                    'path': comment.get('path', ''),
-                    'in_reply_to': comment.get('in_reply_to_id')
-                }
-            })
-        except Exception:
+        if not isinstance(comment, dict) or comment.get('user', {}) is None:
+            continue
+        timestamp = _parse_event_timestamp(comment.get('created_at'))
+        if timestamp is None:
             continue
+        
+        review_comment_events.append({
+            'type': 'review_comment',
+            'timestamp': timestamp,
+            'timestamp_epoch': int(timestamp.timestamp()),
+            'author': comment.get('user', {}).get('login', 'Unknown'),
+            'data': {
+                'body': comment.get('body', ''),
+                'path': comment.get('path', ''),
+                'in_reply_to': comment.get('in_reply_to_id')
+            }
+        })
     
     # Process issue comments (general PR comments)
     for comment in timeline_data.get('issue_comments', []):
-        try:
-            events.append({
-                'type': 'issue_comment',
-                'timestamp': parse_github_timestamp(comment.get('created_at', '')),
-                'author': comment.get('user', {}).get('login', 'Unknown'),
-                'data': {
-                    'body': comment.get('body', '')
-                }
-            })
-        except Exception:
+        if not isinstance(comment, dict) or comment.get('user', {}) is None:
             continue
-    
-    # Sort all events by timestamp
-    events.sort(key=lambda x: x['timestamp'])
-    
-    return events
+        timestamp = _parse_event_timestamp(comment.get('created_at'))
+        if timestamp is None:
+            continue
+        
+        issue_comment_events.append({
+            'type': 'issue_comment',
+            'timestamp': timestamp,
+            'timestamp_epoch': int(timestamp.timestamp()),
+            'author': comment.get('user', {}).get('login', 'Unknown'),
+            'data': {
+                'body': comment.get('body', '')
+            }
+        })
+    
+    # Each endpoint already returns its items in (near) chronological order, so
+    # sorting the per-type lists is close to linear; merging them is then
+    # O(N log 4) instead of re-sorting the combined list
+    by_timestamp = itemgetter('timestamp_epoch')
+    for type_events in (commit_events, review_events, review_comment_events, issue_comment_events):
+        type_events.sort(key=by_timestamp)
+    
+    return list(heapq.merge(
+        commit_events, review_events, review_comment_events, issue_comment_events,
+        key=by_timestamp
+    ))
 
 
 def analyze_review_progress(timeline, pr_author):
@@ -239,87 +410,92 @@ def analyze_review_progress(timeline, pr_author):
         }
     """
     feedback_loops = []
+    # Unresponded feedback, oldest first; the timeline is chronological so the
+    # most recent candidate is always at the end of this stack
+    pending_feedback = []
     latest_review_state = None
     last_reviewer_action = None
     last_author_action = None
+    # Integer mirrors of the timestamps above; int comparisons are much
+    # cheaper than datetime rich comparisons in the loop below
+    last_reviewer_epoch = None
+    last_author_epoch = None
+    
+    reviewer_types = _REVIEWER_EVENT_TYPES
+    author_types = _AUTHOR_EVENT_TYPES
     
     # Iterate through timeline to detect feedback patterns
-    for event in timeline:
-        author = event['author']
-        timestamp = event['timestamp']
-        event_type = event['type']
+    # Pull all fields an event needs in a single C-level call per event
+    for event_type, author, timestamp, epoch, event_data in map(_EVENT_FIELDS, timeline):
         
         # Track reviewer actions (reviews and comments from non-authors)
-        if event_type in ['review', 'review_comment'] and author != pr_author:
+        if event_type in reviewer_types and author != pr_author:
             last_reviewer_action = timestamp
+            last_reviewer_epoch = epoch
             
             # Update latest review state
             if event_type == 'review':
-                latest_review_state = event['data'].get('state', '')
+                latest_review_state = event_data.get('state', '')
             
             # Create feedback loop entry
-            feedback_loops.append({
-                'reviewer': author,
-                'feedback_time': timestamp,
-                'feedback_type': event_type,
-                'author_responded': False,
-                'response_time': None,
-                'response_type': None,
-                'response_delay_hours': None
-            })
+            loop = FeedbackLoop(author, timestamp, event_type, epoch)
+            feedback_loops.append(loop)
+            pending_feedback.append(loop)
         
         # Track author actions (commits and comments from author)
-        elif author == pr_author and event_type in ['commit', 'issue_comment', 'review_comment']:
+        elif author == pr_author and event_type in author_types:
             last_author_action = timestamp
+            last_author_epoch = epoch
             
             # Check if this responds to pending feedback
-            # Match to the most recent unresponded feedback
-            for loop in reversed(feedback_loops):
-                if not loop['author_responded'] and loop['feedback_time'] < timestamp:
-                    loop['author_responded'] = True
-                    loop['response_time'] = timestamp
-                    loop['response_type'] = event_type
+            # Match to the most recent unresponded feedback. Only feedback
+            # sharing this exact timestamp can sit above the match, so the
+            # scan is amortised O(1) instead of walking every earlier loop.
+            for idx in range(len(pending_feedback) - 1, -1, -1):
+                loop = pending_feedback[idx]
+                if loop.feedback_epoch < epoch:
+                    del pending_feedback[idx]
+                    loop.author_responded = True
+                    loop.response_time = timestamp
+                    loop.response_type = event_type
                     
                     # Calculate delay in hours
-                    delay = (timestamp - loop['feedback_time']).total_seconds() / 3600
-                    loop['response_delay_hours'] = round(delay, 1)
+                    delay = (epoch - loop.feedback_epoch) / 3600
+                    loop.response_delay_hours = round(delay, 1)
                     break
     
     # Calculate response metrics
     total_feedback = len(feedback_loops)
-    responded_count = sum(1 for loop in feedback_loops if loop['author_responded'])
+    responded_count = total_feedback - len(pending_feedback)
     response_rate = responded_count / total_feedback if total_feedback > 0 else 1.0
     
     # Determine current state
-    awaiting_author = (
-        latest_review_state == 'CHANGES_REQUESTED' or
-        (last_reviewer_action and 
-         (not last_author_action or last_reviewer_action > last_author_action))
-    )
-    
-    awaiting_reviewer = (
-        not awaiting_author and
-        last_author_action and
-        (not last_reviewer_action or last_author_action > last_reviewer_action)
-    )
+    if latest_review_state == 'CHANGES_REQUESTED':
+        awaiting_author, awaiting_reviewer = True, False
+    else:
+        order = 0
+        if last_reviewer_epoch is not None and last_author_epoch is not None:
+            order = (last_reviewer_epoch > last_author_epoch) - (last_reviewer_epoch < last_author_epoch)
+        awaiting_author, awaiting_reviewer = _AWAITING_STATES[
+            (last_reviewer_epoch is not None, last_author_epoch is not None, order)
+        ]
     
     # Find stale feedback (older than 3 days without response)
-    now = datetime.now(timezone.utc)
-    stale_threshold_hours = 72  # 3 days
+    now = datetime.now(timezone.utc).timestamp()
+    stale_cutoff = now - 72 * 3600  # 3 days
     
     stale_feedback = []
-    for loop in feedback_loops:
-        if not loop['author_responded']:
-            hours_old = (now - loop['feedback_time']).total_seconds() / 3600
-            if hours_old > stale_threshold_hours:
-                stale_feedback.append({
-                    'reviewer': loop['reviewer'],
-                    'feedback_type': loop['feedback_type'],
-                    'days_old': round(hours_old / 24, 1)
-                })
+    for loop in pending_feedback:
+        if loop.feedback_epoch < stale_cutoff:
+            days_old = (now - loop.feedback_epoch) / 86400
+            stale_feedback.append({
+                'reviewer': loop.reviewer,
+                'feedback_type': loop.feedback_type,
+                'days_old': round(days_old, 1)
+            })
     
     return {
-        'feedback_loops': feedback_loops,
+        'feedback_loops': [loop.to_dict() for loop in feedback_loops],
         'total_feedback_count': total_feedback,
         'responded_count': responded_count,
         'response_rate': response_rate,
@@ -428,14 +604,11 @@ def calculate_ci_confidence(checks_passed, checks_failed, checks_skipped):
         return 100
     
     # Calculate based on pass rate, penalize failures more than skipped
-    pass_rate = checks_passed / total_checks
-    fail_rate = checks_failed / total_checks
-    skip_rate = checks_skipped / total_checks
-    
     # Weighted score: passes add, failures subtract (reduced for flaky test tolerance), skips slightly reduce
-    score = (pass_rate * 100) - (fail_rate * 50) - (skip_rate * 20)
+    # Integer arithmetic keeps this exact and avoids three float divisions
+    score = (checks_passed * 100 - checks_failed * 50 - checks_skipped * 20) // total_checks
     
-    return max(0, min(100, int(score)))
+    return max(0, min(100, score))
 
 
 def calculate_pr_readiness(pr_data, review_classification, review_score):
@@ -460,12 +633,17 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
             'recommendations': List[str]
         }
     """
+    # Read every PR field once up front
+    checks_passed = pr_data.get('checks_passed', 0)
+    checks_failed = pr_data.get('checks_failed', 0)
+    checks_skipped = pr_data.get('checks_skipped', 0)
+    mergeable_state = pr_data.get('mergeable_state', '')
+    is_draft = pr_data.get('is_draft') == 1 or pr_data.get('is_draft') == True
+    open_conversations_count = pr_data.get('open_conversations_count', 0)
+    files_changed = pr_data.get('files_changed', 0)
+    
     # Calculate CI score
-    ci_score = calculate_ci_confidence(
-        pr_data.get('checks_passed', 0),
-        pr_data.get('checks_failed', 0),
-        pr_data.get('checks_skipped', 0)
-    )
+    ci_score = calculate_ci_confidence(checks_passed, checks_failed, checks_skipped)
     
     # Weighted combination: 45% CI, 55% Review (reduced CI weight due to flaky tests)
     overall_score_raw = (ci_score * 0.45) + (review_score * 0.55)
@@ -478,19 +656,16 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
     # Note: this multiplier compounds with other score multipliers (e.g. changes
     # requested), so a PR with both conditions would be scaled by
     # 0.5 * 0.67 = 0.335 (~66.5% total reduction).
-    mergeable_state = pr_data.get('mergeable_state', '')
     if mergeable_state == 'dirty':
         overall_score_raw *= _MERGE_CONFLICTS_SCORE_MULTIPLIER
     
     overall_score = int(overall_score_raw)
     
     # Force score to 0% for Draft PRs
-    is_draft = pr_data.get('is_draft') == 1 or pr_data.get('is_draft') == True
     if is_draft:
         overall_score = 0
     
     # Deduct 3 points for each open conversation
-    open_conversations_count = pr_data.get('open_conversations_count', 0)
     if open_conversations_count > 0:
         overall_score = max(0, overall_score - (open_conversations_count * 3))
     
@@ -505,9 +680,6 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
         recommendations.append("Convert to 'Ready for review' when finished")
     
     # CI blockers (with tolerance for 1-2 flaky test failures)
-    checks_failed = pr_data.get('checks_failed', 0)
-    checks_skipped = pr_data.get('checks_skipped', 0)
-    
     if checks_failed > 2:
         blockers.append(f"{checks_failed} CI check(s) failing")
         recommendations.append("Fix failing CI checks before merging")
@@ -542,7 +714,6 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
     if pr_data.get('is_merged') == 1:
         blockers.append("PR is already merged")
     
-    mergeable_state = pr_data.get('mergeable_state', '')
     if mergeable_state == 'dirty':
         blockers.append("PR has merge conflicts")
         recommendations.append("Resolve merge conflicts with base branch")
@@ -550,7 +721,6 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
         warnings.append("PR is blocked by required status checks or reviews")
     
     # File change warnings
-    files_changed = pr_data.get('files_changed', 0)
     if files_changed > 30:
         warnings.append(f"Large PR ({files_changed} files changed)")
         recommendations.append("Consider splitting into smaller PRs for easier review")
@@ -564,18 +734,16 @@ def calculate_pr_readiness(pr_data, review_classification, review_score):
     merge_ready = (
         overall_score >= 70 and
         len(blockers) == 0 and
-        review_classification in ['APPROVED', 'AWAITING_REVIEWER', 'ACTIVE']
+        review_classification in _MERGE_READY_REVIEW_CLASSIFICATIONS
     )
     
     # Overall classification
     if merge_ready:
         classification = 'READY_TO_MERGE'
-    elif overall_score >= 60:
-        classification = 'NEARLY_READY'
-    elif overall_score >= 40:
-        classification = 'NEEDS_WORK'
     else:
-        classification = 'NOT_READY'
+        classification = _READINESS_SCORE_LABELS[
+            bisect.bisect_right(_READINESS_SCORE_THRESHOLDS, overall_score)
+        ]
     
     return {
         'overall_score': overall_score,